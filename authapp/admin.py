@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
-from .models import Role, BusinessElement, User, AccessRule
+from .models import Role, BusinessElement, User, AccessRule, ServiceClient
+from .paginators import EstimatedCountPaginator
+from .services import UserService
 # Register your models here.
 
 class AccessRoleRuleInline(admin.StackedInline):
@@ -10,7 +12,7 @@ class AccessRoleRuleInline(admin.StackedInline):
 @admin.register(Role)
 class RoleAdmin(ModelAdmin):
     inlines = [AccessRoleRuleInline]
-    list_display = ('name', 'created_at')
+    list_display = ('name', 'parent', 'created_at')
     search_fields = ('name',)
     ordering = ('name',)
 
@@ -24,14 +26,18 @@ class BusinessElementAdmin(ModelAdmin):
 class UserAdmin(ModelAdmin):
     list_display = ('email', 'role', 'is_active', 'is_staff', 'created_at')
     list_filter = ('is_active', 'is_staff', 'is_superuser', 'role')
+    list_select_related = ('role',)
+    # Поиск по UPPER(...) LIKE использует триграммные индексы из Meta.indexes модели
     search_fields = ('email', 'first_name', 'last_name')
     ordering = ('email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
-        ('Персональная информация', {'fields': ('first_name', 'last_name', 'role')}),
+        ('Персональная информация', {'fields': ('first_name', 'last_name', 'role', 'roles')}),
         ('Правав доступа', {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
-        ('Даты', {'fields': ('last_login', 'created_at', 'updated_at')}),
+        ('Даты', {'fields': ('last_login', 'last_seen', 'created_at', 'updated_at')}),
     ) 
 
     add_fieldsets = (
@@ -41,11 +47,44 @@ class UserAdmin(ModelAdmin):
         }),
     )
 
-    readonly_fields = ('last_login', 'created_at', 'updated_at')
+    readonly_fields = ('last_login', 'last_seen', 'created_at', 'updated_at')
+    filter_horizontal = ('roles',)
+    actions = ('deactivate_users', 'reactivate_users')
+
+    def get_search_results(self, request, queryset, search_term):
+        # Ввод с '@' - это email: поиск по префиксу идет по btree-индексу без OR по именам.
+        # Домен без локальной части ('@example.com') префиксом не найти, он ищется по вхождению
+        term = search_term.strip()
+        if '@' in term and ' ' not in term and not term.startswith('@'):
+            return queryset.filter(email__istartswith=term), False
+        return super().get_search_results(request, queryset, search_term)
+
+    @admin.action(description='Деактивировать выбранных пользователей и отозвать их токены')
+    def deactivate_users(self, request, queryset) -> None:
+        updated = UserService.bulk_set_active(queryset.values_list('id', flat=True), is_active=False)
+        self.message_user(request, f'Деактивировано пользователей: {updated}')
+
+    @admin.action(description='Активировать выбранных пользователей')
+    def reactivate_users(self, request, queryset) -> None:
+        updated = UserService.bulk_set_active(queryset.values_list('id', flat=True), is_active=True)
+        self.message_user(request, f'Активировано пользователей: {updated}')
 
 @admin.register(AccessRule)
 class AccessRuleAdmin(ModelAdmin):
     list_display = ('role', 'business_element', 'read_permission', 'update_permission', 'delete_permission')
     list_filter = ('role', 'business_element', 'read_permission', 'update_permission', 'delete_permission')
     search_fields = ('role__name', 'business_element__name')
-    ordering = ('role__name', 'business_element__name')
\ No newline at end of file
+    ordering = ('role__name', 'business_element__name')
+
+@admin.register(ServiceClient)
+class ServiceClientAdmin(ModelAdmin):
+    # Клиенты создаются командой create_service_client: секрет показывается один раз
+    list_display = ('name', 'client_id', 'user', 'is_active', 'created_at')
+    list_filter = ('is_active',)
+    list_select_related = ('user',)
+    search_fields = ('name', 'client_id')
+    ordering = ('name',)
+    readonly_fields = ('client_id', 'secret_hash', 'user', 'created_at', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
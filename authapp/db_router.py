@@ -0,0 +1,67 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from typing import Optional, Any
+
+_pinned_to_primary: ContextVar[bool] = ContextVar('pinned_to_primary', default=False)
+_has_written: ContextVar[bool] = ContextVar('has_written', default=False)
+
+
+def _get_pin_key(user_id: Any) -> str:
+    return f"db:pin:user:{user_id}"
+
+
+def reset_request_state() -> None:
+    _pinned_to_primary.set(False)
+    _has_written.set(False)
+
+
+def pin_to_primary() -> None:
+    _pinned_to_primary.set(True)
+
+
+def has_written() -> bool:
+    return _has_written.get()
+
+
+def pin_if_recent_writer(user_id: Any) -> None:
+    # "Read your writes": после собственной записи пользователь какое-то время читает с primary
+    if settings.DATABASE_REPLICAS and user_id is not None:
+        # Импорт внутри функции: роутер загружается раньше приложений
+        from authapp.services.safe_cache import SafeCache
+        if SafeCache.get(_get_pin_key(user_id)):
+            pin_to_primary()
+
+
+def remember_write(user_id: Any) -> None:
+    if settings.DATABASE_REPLICAS and user_id is not None:
+        from authapp.services.safe_cache import SafeCache
+        SafeCache.set(_get_pin_key(user_id), 1, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+class ReplicaRouter:
+    route_app_labels = {'authapp'}
+
+    def db_for_read(self, model: Any, **hints: Any) -> Optional[str]:
+        if model._meta.app_label not in self.route_app_labels:
+            return None
+
+        if not settings.DATABASE_REPLICAS or _pinned_to_primary.get() or _has_written.get():
+            return 'default'
+
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: Any, **hints: Any) -> Optional[str]:
+        _has_written.set(True)
+        return 'default'
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> Optional[bool]:
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> Optional[bool]:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
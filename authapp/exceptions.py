@@ -8,4 +8,14 @@ class InactiveUserError(AuthenticationError):
     pass
 
 class TokenBlackListError(AuthenticationError):
-    pass
\ No newline at end of file
+    pass
+
+class RevocationStoreUnavailable(TokenBlackListError):
+    # Redis недоступен; found содержит значения, найденные в локальном резервном хранилище
+    def __init__(self, found: dict) -> None:
+        super().__init__("Хранилище отзыва токенов недоступно")
+        self.found = found
+
+class ActivityStoreUnavailable(Exception):
+    # Redis не ответил на запрос статистики активности
+    pass
@@ -0,0 +1,35 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import models
+
+
+class PostgresOnlyIndexMixin:
+    # Индексы с классами операторов PostgreSQL; на SQLite для локальной разработки они не создаются
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+
+class PostgresGinIndex(PostgresOnlyIndexMixin, GinIndex):
+    pass
+
+
+class PostgresIndex(PostgresOnlyIndexMixin, models.Index):
+    pass
+
+
+class PostgresAddIndexConcurrently(AddIndexConcurrently):
+    # CREATE INDEX CONCURRENTLY есть только в PostgreSQL, на других СУБД операция меняет лишь состояние
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
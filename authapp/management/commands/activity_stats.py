@@ -0,0 +1,36 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp.exceptions import ActivityStoreUnavailable
+from authapp.services.activity_service import ActivityService
+
+
+class Command(BaseCommand):
+    help = 'Показывает DAU/MAU и частоту логинов, обновлений токенов и ошибок'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Вывести результат в JSON')
+
+    def handle(self, *args, **options):
+        try:
+            stats = ActivityService.get_stats()
+        except ActivityStoreUnavailable as e:
+            raise CommandError(str(e))
+        if not stats:
+            raise CommandError('Учет активности выключен или кэш не на Redis')
+
+        if options['json']:
+            self.stdout.write(json.dumps(stats, ensure_ascii=False, indent=2))
+            return
+
+        self.stdout.write(f"Дата: {stats['date']}  DAU: {stats['dau']}  MAU (30 дней): {stats['mau']}")
+        self.stdout.write(f"{'событие':<16}{'1 мин':>8}{'5 мин':>8}{'1 час':>8}{'24 часа':>10}")
+        for event, counters in stats['events'].items():
+            self.stdout.write(
+                f"{event:<16}{counters['last_minute']:>8}{counters['last_5_minutes']:>8}"
+                f"{counters['last_hour']:>8}{counters['last_24_hours']:>10}"
+            )
+
+        for title, key in (('логинов', 'login_failure_rate'), ('обновлений токена', 'refresh_failure_rate')):
+            rate = stats[key]
+            self.stdout.write(f"Доля неудачных {title} за час: {'-' if rate is None else f'{rate:.1%}'}")
@@ -0,0 +1,61 @@
+import timeit
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from authapp.models import User
+from authapp.renderers import FastJSONRenderer
+from authapp.serializers import (
+    FastLoginResponseSerializer, FastUserSerializer, LoginResponseSerializer, UserSerializer
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает вывод и пропускную способность DRF и быстрых сериализаторов auth-ответов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        user = User(
+            id=42, email='user@example.com', first_name='Иван',
+            last_name='Иванов', role_id=3, is_active=True
+        )
+        tokens = {
+            'access_token': 'a' * 180,
+            'refresh_token': 'r' * 180,
+            'token_type': 'bearer',
+            'expires_in': 1800,
+            'refresh_expires_in': 604800,
+        }
+        drf_renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+
+        cases = {
+            'login': (
+                lambda: drf_renderer.render(LoginResponseSerializer({
+                    'user': user, 'tokens': tokens, 'message': 'Успешная авторизация'
+                }).data),
+                lambda: fast_renderer.render(FastLoginResponseSerializer.to_representation(
+                    user, tokens, 'Успешная авторизация'
+                )),
+            ),
+            'profile': (
+                lambda: drf_renderer.render(UserSerializer(user).data),
+                lambda: fast_renderer.render(FastUserSerializer.to_representation(user)),
+            ),
+            'logout': (
+                lambda: drf_renderer.render({'message': 'Успешный выход из системы'}),
+                lambda: fast_renderer.render({'message': 'Успешный выход из системы'}),
+            ),
+        }
+
+        self.stdout.write(f"{'ответ':<10}{'идентичен':>11}{'DRF ops/s':>14}{'fast ops/s':>14}{'ускорение':>12}")
+        for name, (baseline, fast) in cases.items():
+            identical = baseline() == fast()
+            baseline_rate = iterations / timeit.timeit(baseline, number=iterations)
+            fast_rate = iterations / timeit.timeit(fast, number=iterations)
+            self.stdout.write(
+                f"{name:<10}{str(identical):>11}{baseline_rate:>14.0f}{fast_rate:>14.0f}"
+                f"{fast_rate / baseline_rate:>11.1f}x"
+            )
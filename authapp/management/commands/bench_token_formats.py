@@ -0,0 +1,28 @@
+import timeit
+from django.core.management.base import BaseCommand
+
+from authapp.services.jwt_service import JWTService
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает размер и скорость проверки токенов форматов v1 и v2'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        user_data = {'id': 123456, 'email': 'employee.name@example.com'}
+
+        self.stdout.write(f"{'формат':<10}{'тип':<10}{'байт':>8}{'header':>9}{'verify ops/s':>15}")
+        for version in (1, 2):
+            for token_type, expires_delta in (
+                ('access', JWTService.ACCESS_TOKEN_EXPIRE_MINUTES),
+                ('refresh', JWTService.REFRESH_TOKEN_EXPIRE_DAYS),
+            ):
+                token = JWTService._generate_token(user_data, token_type, expires_delta, version=version)
+                header_size = len(f'Authorization: Bearer {token}')
+                rate = iterations / timeit.timeit(lambda: JWTService.verify_token(token), number=iterations)
+                self.stdout.write(
+                    f"{f'v{version}':<10}{token_type:<10}{len(token):>8}{header_size:>9}{rate:>15.0f}"
+                )
@@ -0,0 +1,93 @@
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from authapp.models import User
+from authapp.paginators import EstimatedCountPaginator
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает поиск и подсчет пользователей в админке с индексами и без на заполненной таблице'
+
+    FIRST_NAMES = ('Александр', 'Мария', 'Иван', 'Елена', 'Дмитрий', 'Ольга', 'Сергей', 'Анна')
+    LAST_NAME_PARTS = ('ов', 'ев', 'ин', 'ск', 'ман', 'берг', 'енко', 'ук')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Сколько пользователей добавить перед замером')
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Бенчмарк рассчитан на PostgreSQL с индексами из миграций authapp')
+
+        if options['seed']:
+            self._seed(options['seed'], options['batch_size'])
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {User._meta.db_table}')
+
+        sample = User.objects.order_by('-id').values_list('email', 'last_name').first()
+        if sample is None:
+            raise CommandError('Таблица пользователей пуста, запустите с --seed')
+        email_prefix = sample[0].split('@')[0] + '@'
+        name_part = sample[1][1:5]
+
+        def search_all_fields(term):
+            return User.objects.filter(
+                Q(email__icontains=term) | Q(first_name__icontains=term) | Q(last_name__icontains=term)
+            )
+
+        cases = (
+            ('поиск по имени', lambda: search_all_fields(name_part), lambda: search_all_fields(name_part)),
+            ('поиск по email', lambda: search_all_fields(email_prefix), lambda: User.objects.filter(email__istartswith=email_prefix)),
+        )
+
+        iterations = options['iterations']
+        self.stdout.write(f"Пользователей: {User.objects.count()}, итераций: {iterations}")
+        self.stdout.write(f"{'сценарий':<20}{'было, мс':>12}{'стало, мс':>12}")
+        for title, old_queryset, new_queryset in cases:
+            before = self._measure(old_queryset, iterations, use_indexes=False)
+            after = self._measure(new_queryset, iterations, use_indexes=True)
+            self.stdout.write(f"{title:<20}{before:>12.2f}{after:>12.2f}")
+
+        exact = self._timeit(lambda: User.objects.count(), iterations)
+        estimated = self._timeit(
+            lambda: EstimatedCountPaginator(User.objects.all(), 100).count, iterations
+        )
+        self.stdout.write(f"{'подсчет строк':<20}{exact:>12.2f}{estimated:>12.2f}")
+
+    def _seed(self, total, batch_size):
+        start = User.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        for offset in range(0, total, batch_size):
+            User.objects.bulk_create([
+                User(
+                    email=f'bench.user{start + number}@example.com',
+                    first_name=random.choice(self.FIRST_NAMES),
+                    last_name='Петр' + ''.join(random.choices(self.LAST_NAME_PARTS, k=3)),
+                    password='!'
+                )
+                for number in range(offset, min(offset + batch_size, total))
+            ])
+            self.stdout.write(f'Добавлено {min(offset + batch_size, total)} из {total}')
+
+    def _measure(self, get_queryset, iterations, use_indexes):
+        # Страница changelist: 100 строк по email с ролью через JOIN
+        def run_page():
+            list(get_queryset().select_related('role').order_by('email')[:100])
+
+        with transaction.atomic():
+            if not use_indexes:
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_bitmapscan = off')
+                    cursor.execute('SET LOCAL enable_indexscan = off')
+            return self._timeit(run_page, iterations)
+
+    @staticmethod
+    def _timeit(func, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - started) / iterations * 1000
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp.models import Role, ServiceClient
+from authapp.services.client_credentials import ClientCredentialsService
+
+
+class Command(BaseCommand):
+    help = 'Создает сервисного клиента для client credentials или выпускает ему новый секрет'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', nargs='?', help='Название клиента')
+        parser.add_argument('--role', help='Название роли, правила которой определяют доступ клиента')
+        parser.add_argument('--rotate', metavar='CLIENT_ID', help='Выпустить новый секрет для существующего клиента')
+
+    def handle(self, *args, **options):
+        if options['rotate']:
+            client = ServiceClient.objects.filter(client_id=options['rotate']).first()
+            if client is None:
+                raise CommandError(f"Клиент {options['rotate']} не найден")
+            client_secret = ClientCredentialsService.rotate_secret(client)
+        else:
+            if not options['name']:
+                raise CommandError('Укажите название клиента')
+            role = None
+            if options['role']:
+                role = Role.objects.filter(name=options['role']).first()
+                if role is None:
+                    raise CommandError(f"Роль {options['role']} не найдена")
+            client, client_secret = ClientCredentialsService.create_client(options['name'], role)
+
+        self.stdout.write(f'client_id: {client.client_id}')
+        self.stdout.write(f'client_secret: {client_secret}')
+        self.stdout.write('Секрет хранится только в виде хэша и больше не будет показан')
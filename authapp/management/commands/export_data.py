@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from authapp.services.export_service import ExportService
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка пользователей, ролей или правил доступа в CSV/JSONL'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(ExportService.DATASETS))
+        parser.add_argument('--output-format', choices=ExportService.FORMATS, default=ExportService.FORMAT_CSV)
+        parser.add_argument('--output', help='Файл для записи, по умолчанию stdout')
+
+    def handle(self, *args, **options):
+        chunks = ExportService.stream(options['dataset'], options['output_format'])
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+            for chunk in chunks:
+                output.write(chunk)
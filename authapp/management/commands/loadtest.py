@@ -0,0 +1,257 @@
+import http.client
+import json
+import multiprocessing
+import random
+import re
+import time
+from collections import defaultdict
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from urllib.parse import urlsplit
+
+from authapp.models import AccessRule, BusinessElement, Role, User
+
+
+LOADTEST_EMAIL = 'loadtest{}@example.com'
+LOADTEST_ROLE = 'loadtest'
+ENDPOINTS = ('login', 'refresh', 'products')
+SERVER_TIMING_PATTERN = re.compile(r'(\w+);dur=([\d.]+)')
+
+
+def _parse_server_timing(header):
+    # 'db;dur=1.20, total;dur=3.40' -> {'db': 0.0012, 'total': 0.0034}
+    return {name: float(duration) / 1000 for name, duration in SERVER_TIMING_PATTERN.findall(header or '')}
+
+
+def _percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class _Client:
+    # Соединение на каждый запрос: keep-alive у runserver дает задержку Nagle/delayed ACK ~40 мс,
+    # а sync-воркеры gunicorn все равно закрывают соединение после ответа
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            connection.request(method, self.prefix + path, body=payload, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read(), _parse_server_timing(response.getheader('Server-Timing'))
+        except (http.client.HTTPException, OSError):
+            return 0, None, {}
+        finally:
+            connection.close()
+
+
+def _run_worker(args):
+    base_url, emails, password, mix, duration, seed = args
+    rng = random.Random(seed)
+    client = _Client(base_url)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    # Суммы по Server-Timing: время в SQL, полное время на сервере и клиентское время тех же запросов
+    timings = defaultdict(lambda: {'db': 0.0, 'total': 0.0, 'client': 0.0})
+
+    def call(endpoint, method, path, body=None, token=None):
+        started = time.perf_counter()
+        status, data, server_timing = client.request(method, path, body, token)
+        elapsed = time.perf_counter() - started
+        latencies[endpoint].append(elapsed)
+        if 'total' in server_timing:
+            timing = timings[endpoint]
+            timing['db'] += server_timing.get('db', 0.0)
+            timing['total'] += server_timing['total']
+            timing['client'] += elapsed
+        if status != 200:
+            errors[endpoint] += 1
+            return None
+        return json.loads(data)
+
+    def login():
+        result = call('login', 'POST', '/login/', {'email': rng.choice(emails), 'password': password})
+        return result['tokens'] if result else None
+
+    tokens = login()
+    endpoints = list(mix)
+    weights = [mix[endpoint] for endpoint in endpoints]
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(endpoints, weights)[0]
+        if endpoint == 'login' or tokens is None:
+            tokens = login() or tokens
+        elif endpoint == 'refresh':
+            result = call('refresh', 'POST', '/refresh/', {'refresh_token': tokens['refresh_token']})
+            if result:
+                tokens = {**tokens, 'access_token': result['access_token']}
+        else:
+            call('products', 'GET', '/products/', token=tokens['access_token'])
+
+    return dict(latencies), dict(errors), dict(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест login/refresh/products: заполняет БД и гоняет смешанную нагрузку '
+        'из нескольких процессов против запущенного сервера'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000/authapp', help='Базовый URL приложения authapp')
+        parser.add_argument('--workers', default='1,2,4,8', help='Числа процессов-клиентов через запятую')
+        parser.add_argument('--duration', type=float, default=15, help='Длительность каждого прогона в секундах')
+        parser.add_argument('--mix', default='login=1,refresh=4,products=15', help='Доли запросов по эндпоинтам')
+        parser.add_argument('--users', type=int, default=200, help='Сколько тестовых пользователей использовать')
+        parser.add_argument('--password', default='LoadTest-passw0rd')
+        parser.add_argument('--seed', action='store_true', help='Создать тестовых пользователей, роль и правило доступа')
+        parser.add_argument('--json', dest='json_path', help='Сохранить результаты в JSON')
+
+    def handle(self, *args, **options):
+        try:
+            mix = {
+                endpoint: float(weight)
+                for endpoint, weight in (item.split('=') for item in options['mix'].split(','))
+            }
+            worker_counts = [int(value) for value in options['workers'].split(',')]
+        except ValueError:
+            raise CommandError('Неверный формат --mix или --workers')
+        if set(mix) - set(ENDPOINTS):
+            raise CommandError(f'Допустимые эндпоинты в --mix: {", ".join(ENDPOINTS)}')
+
+        if options['seed']:
+            self._seed(options['users'], options['password'])
+
+        emails = [LOADTEST_EMAIL.format(number) for number in range(options['users'])]
+        # Дочерние процессы работают только по HTTP, открытые соединения с БД им не передаются
+        connections.close_all()
+
+        report = []
+        self.stdout.write(
+            f"{'процессы':>9} {'эндпоинт':<10}{'запросов':>10}{'ошибок':>8}{'rps':>10}"
+            f"{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'БД':>7}{'прил.':>7}{'ожид.':>7}"
+        )
+        for workers in worker_counts:
+            jobs = [
+                (options['url'], emails, options['password'], mix, options['duration'], workers * 1000 + index)
+                for index in range(workers)
+            ]
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.map(_run_worker, jobs)
+
+            for endpoint in ENDPOINTS:
+                samples = sorted(
+                    latency for latencies, _, _ in results for latency in latencies.get(endpoint, [])
+                )
+                if not samples:
+                    continue
+                row = {
+                    'workers': workers,
+                    'endpoint': endpoint,
+                    'requests': len(samples),
+                    'errors': sum(errors.get(endpoint, 0) for _, errors, _ in results),
+                    'rps': len(samples) / options['duration'],
+                    'p50_ms': _percentile(samples, 50) * 1000,
+                    'p95_ms': _percentile(samples, 95) * 1000,
+                    'p99_ms': _percentile(samples, 99) * 1000,
+                    **self._split_time([timings.get(endpoint) for _, _, timings in results]),
+                }
+                report.append(row)
+                shares = ''.join(
+                    f"{row[key]:>7.0%}" if row[key] is not None else f"{'-':>7}"
+                    for key in ('db_share', 'app_share', 'wait_share')
+                )
+                self.stdout.write(
+                    f"{workers:>9} {endpoint:<10}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10.1f}"
+                    f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{shares}"
+                )
+
+        self._write_scaling(report, worker_counts)
+        self._write_bottlenecks(report, worker_counts)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+    @staticmethod
+    def _split_time(timings):
+        # Доли клиентского времени: SQL, остальная обработка на сервере (Python, bcrypt, Redis)
+        # и ожидание вне обработчика (очередь к воркерам сервера и сеть)
+        db = sum(timing['db'] for timing in timings if timing)
+        total = sum(timing['total'] for timing in timings if timing)
+        client = sum(timing['client'] for timing in timings if timing)
+        if not client:
+            return {'db_share': None, 'app_share': None, 'wait_share': None}
+        return {
+            'db_share': db / client,
+            'app_share': (total - db) / client,
+            'wait_share': max(client - total, 0.0) / client,
+        }
+
+    def _write_bottlenecks(self, report, worker_counts):
+        rows = [row for row in report if row['workers'] == worker_counts[-1] and row['db_share'] is not None]
+        if not rows:
+            self.stdout.write(
+                '\nЗаголовка Server-Timing нет: узкое место не определено. '
+                'Запустите сервер с SERVER_TIMING_ENABLED=True'
+            )
+            return
+
+        labels = {
+            'db_share': 'SQL (PostgreSQL)',
+            'app_share': 'обработка на сервере (CPU, bcrypt, Redis)',
+            'wait_share': 'ожидание свободного воркера и сеть',
+        }
+        self.stdout.write(f'\nОсновная доля времени при {worker_counts[-1]} процессах:')
+        for row in rows:
+            key = max(labels, key=lambda name: row[name])
+            self.stdout.write(f"{row['endpoint']:<10} {labels[key]} ({row[key]:.0%})")
+
+    def _write_scaling(self, report, worker_counts):
+        # Эффективность = rps(N) / (N * rps(1)); падение показывает, где упирается сервис
+        base_workers = worker_counts[0]
+        base = {row['endpoint']: row['rps'] for row in report if row['workers'] == base_workers}
+        self.stdout.write('\nМасштабирование относительно первого прогона:')
+        for row in report:
+            if row['workers'] == base_workers or not base.get(row['endpoint']):
+                continue
+            efficiency = row['rps'] / (base[row['endpoint']] * row['workers'] / base_workers)
+            self.stdout.write(f"{row['workers']:>9} {row['endpoint']:<10}{efficiency:>10.0%}")
+
+    def _seed(self, users, password):
+        role, _ = Role.objects.get_or_create(name=LOADTEST_ROLE)
+        element, _ = BusinessElement.objects.get_or_create(name='product')
+        AccessRule.objects.update_or_create(
+            role=role,
+            business_element=element,
+            defaults={'read_permission': True, 'read_all_permission': True}
+        )
+
+        # Один bcrypt-хэш на всех: заполнение не должно само упираться в CPU
+        password_hash = make_password(password)
+        existing = set(User.objects.filter(email__startswith='loadtest').values_list('email', flat=True))
+        User.objects.bulk_create([
+            User(
+                email=LOADTEST_EMAIL.format(number),
+                first_name='Load',
+                last_name='Test',
+                role=role,
+                password=password_hash
+            )
+            for number in range(users)
+            if LOADTEST_EMAIL.format(number) not in existing
+        ])
+        self.stdout.write(f'Тестовых пользователей: {users}, роль: {role.name}')
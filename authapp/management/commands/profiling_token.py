@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core import signing
+from django.core.management.base import BaseCommand
+
+from authapp.middleware import PROFILING_SIGNER_SALT
+
+
+class Command(BaseCommand):
+    help = 'Выпускает подписанное значение заголовка для профилирования отдельного запроса'
+
+    def handle(self, *args, **options):
+        token = signing.TimestampSigner(salt=PROFILING_SIGNER_SALT).sign('profile')
+        self.stdout.write(f"{settings.PROFILING_HEADER}: {token}")
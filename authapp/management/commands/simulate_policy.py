@@ -0,0 +1,56 @@
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp.serializers import PolicySimulationSerializer
+from authapp.services.policy_simulation import PolicySimulationService
+
+
+class Command(BaseCommand):
+    help = (
+        'Пробный прогон изменения правил доступа: показывает, какие решения и у скольких '
+        'пользователей поменяются, без записи в БД'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'changes',
+            nargs='?',
+            help='JSON-файл со списком изменений (как поле changes в API), по умолчанию stdin'
+        )
+        parser.add_argument('--json', dest='json_path', help='Сохранить полный результат в JSON')
+
+    def handle(self, *args, **options):
+        try:
+            if options['changes']:
+                with open(options['changes'], encoding='utf-8') as source:
+                    changes = json.load(source)
+            else:
+                changes = json.load(sys.stdin)
+        except (OSError, ValueError) as error:
+            raise CommandError(f'Не удалось прочитать изменения: {error}')
+
+        serializer = PolicySimulationSerializer(data={'changes': changes})
+        if not serializer.is_valid():
+            raise CommandError(json.dumps(serializer.errors, ensure_ascii=False))
+
+        result = PolicySimulationService.simulate(serializer.validated_data['changes'])
+
+        self.stdout.write(
+            f"Проверено комбинаций (роль, элемент, метод): {result['evaluated_combinations']}, "
+            f"затронуто пользователей: {result['affected_users']}"
+        )
+        self.stdout.write(f"{'роль':<20}{'элемент':<20}{'метод':<8}{'было':<6}{'стало':<6}")
+        for flip in result['role_decision_changes']:
+            self.stdout.write(
+                f"{flip['role']:<20}{flip['business_element']:<20}{flip['method']:<8}{flip['old']:<6}{flip['new']:<6}"
+            )
+        self.stdout.write(f"\n{'элемент':<20}{'метод':<8}{'было':<6}{'стало':<6}{'пользователей':>14}")
+        for flip in result['user_decision_changes']:
+            self.stdout.write(
+                f"{flip['business_element']:<20}{flip['method']:<8}{flip['old']:<6}{flip['new']:<6}{flip['users']:>14}"
+            )
+
+        if options['json_path']:
+            with open(options['json_path'], 'w', encoding='utf-8') as output:
+                json.dump(result, output, ensure_ascii=False, indent=2)
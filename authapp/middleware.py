@@ -0,0 +1,273 @@
+import cProfile
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core import signing
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.urls import URLResolver, get_resolver
+from django.utils import timezone
+
+from rest_framework import exceptions
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from authapp import db_router
+from authapp.permissions import HasPermission
+from authapp.services.authentication import JWTAuthentication
+from authapp.services.jwt_service import JWTService
+
+logger = logging.getLogger(__name__)
+
+PROFILING_SIGNER_SALT = 'authapp.profiling'
+
+
+class ReplicaPinMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        db_router.reset_request_state()
+
+        # Пользователь админки определяется по сессии без загрузки строки из БД
+        session = getattr(request, 'session', None)
+        if session is not None:
+            db_router.pin_if_recent_writer(session.get(SESSION_KEY))
+
+        response = self.get_response(request)
+
+        if db_router.has_written():
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                db_router.remember_write(user.pk)
+
+        return response
+
+
+class TokenRenewalMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.JWT_SLIDING_RENEWAL_WINDOW:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        # Отметку ставит JWTAuthentication, если access токен близок к истечению; ошибки не продлевают токен
+        renewal = getattr(request, 'token_renewal', None)
+        if renewal is not None and 200 <= response.status_code < 300:
+            token, payload = renewal
+            try:
+                renewed = JWTService.get_renewed_access_token(token, payload)
+                if renewed is not None:
+                    response[settings.JWT_SLIDING_RENEWAL_HEADER] = renewed
+            except Exception:
+                # Продление необязательно: клиент сможет обновить токен через refresh
+                logger.warning("Не удалось выпустить продленный access токен", exc_info=True)
+
+        return response
+
+
+class RouteAuthorizationMiddleware:
+    # Проверка HasPermission сразу после разрешения URL: до создания view, разбора тела и DRF-аутентификации
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.ROUTE_AUTHORIZATION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.permission = HasPermission()
+        self.routes = self.compile_routes()
+        logger.debug("Маршрутов с проверкой прав: %s", len(self.routes))
+
+    @staticmethod
+    def _iter_routes(patterns: Any, namespaces: Tuple[str, ...] = ()) -> Iterator[Tuple[str, Callable]]:
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                nested = namespaces + ((pattern.namespace,) if pattern.namespace else ())
+                yield from RouteAuthorizationMiddleware._iter_routes(pattern.url_patterns, nested)
+            elif pattern.name:
+                yield ':'.join((*namespaces, pattern.name)), pattern.callback
+
+    @staticmethod
+    def _compile_route(callback: Callable) -> Optional[Tuple[Optional[str], bool, bool, bool]]:
+        # (бизнес-элемент, DRF-view, только для staff, нужно явное правило) или None, если маршрут не защищен
+        # ни HasPermission, ни IsAdminUser
+        view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+        if view_class is not None and issubclass(view_class, APIView):
+            permission_classes = [cls for cls in view_class.permission_classes if isinstance(cls, type)]
+            has_permission = any(issubclass(cls, HasPermission) for cls in permission_classes)
+            staff_only = any(issubclass(cls, IsAdminUser) for cls in permission_classes)
+            if not has_permission and not staff_only:
+                return None
+            element_name = getattr(view_class, 'business_element', None) if has_permission else None
+            require_rule = has_permission and getattr(view_class, 'require_access_rule', False)
+            return element_name, True, staff_only, require_rule
+
+        element_name = getattr(view_class or callback, 'business_element', None)
+        require_rule = getattr(view_class or callback, 'require_access_rule', False)
+        return (element_name, False, False, require_rule) if element_name else None
+
+    @staticmethod
+    def compile_routes() -> Dict[str, Tuple[Optional[str], bool, bool, bool]]:
+        # Ключ - view_name из resolver_match (имя маршрута с пространствами имен)
+        routes = {}
+        for view_name, callback in RouteAuthorizationMiddleware._iter_routes(get_resolver().url_patterns):
+            policy = RouteAuthorizationMiddleware._compile_route(callback)
+            if policy is not None:
+                routes[view_name] = policy
+        return routes
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        return self.get_response(request)
+
+    @staticmethod
+    def _deny(error: exceptions.APIException) -> JsonResponse:
+        # Как exception_handler DRF; у JWTAuthentication нет authenticate_header,
+        # поэтому отсутствие учетных данных и недействительный токен - тоже 403
+        if isinstance(error, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            status = 403
+        else:
+            status = error.status_code
+        data = error.detail if isinstance(error.detail, (list, dict)) else {'detail': error.detail}
+        response = JsonResponse(data, status=status, safe=False, json_dumps_params={'ensure_ascii': False})
+        if getattr(error, 'wait', None):
+            response['Retry-After'] = '%d' % error.wait
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any) -> Optional[HttpResponse]:
+        policy = self.routes.get(request.resolver_match.view_name)
+        if policy is None:
+            return None
+        element_name, is_drf_view, staff_only, require_rule = policy
+
+        try:
+            # Request только оборачивает HttpRequest, тело при этом не читается
+            authenticated = JWTAuthentication().authenticate(Request(request))
+        except exceptions.APIException as error:
+            return self._deny(error)
+
+        if authenticated is not None:
+            request.jwt_authentication = authenticated
+            user = authenticated[0]
+        else:
+            # DRF-view в этом проекте аутентифицируются только JWT, обычные Django view - еще и сессией
+            user = None if is_drf_view else getattr(request, 'user', None)
+
+        if user is None or not user.is_authenticated:
+            return self._deny(exceptions.NotAuthenticated())
+        if staff_only and not user.is_staff:
+            return self._deny(exceptions.PermissionDenied())
+        if not self.permission.has_element_permission(user, element_name, request.method, require_rule):
+            return self._deny(exceptions.PermissionDenied())
+        return None
+
+
+class ServerTimingMiddleware:
+    # Грубая разбивка времени ответа для нагрузочного теста: время в SQL и полное время обработки.
+    # Остаток (total - db) - это Python, bcrypt и Redis
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        db_time = 0.0
+
+        def measure(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+            nonlocal db_time
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_time += time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(measure))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = f'db;dur={db_time * 1000:.2f}, total;dur={total * 1000:.2f}'
+        return response
+
+
+class SampledProfilingMiddleware:
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.signer = signing.TimestampSigner(salt=PROFILING_SIGNER_SALT)
+        self.output_dir = Path(settings.PROFILING_DIR)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+    def _get_sample_reason(self, request: HttpRequest) -> Optional[str]:
+        header_value = request.headers.get(settings.PROFILING_HEADER)
+        if header_value:
+            try:
+                self.signer.unsign(header_value, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+                return 'header'
+            except signing.BadSignature:
+                pass
+
+        if random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sample'
+        return None
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        reason = self._get_sample_reason(request)
+        if reason is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duration = time.perf_counter() - started
+
+        self._dump(profiler, request, response, duration, reason)
+        return response
+
+    def _dump(
+        self,
+        profiler: cProfile.Profile,
+        request: HttpRequest,
+        response: HttpResponse,
+        duration: float,
+        reason: str
+    ) -> None:
+        now = timezone.now()
+        path_slug = re.sub(r'[^a-zA-Z0-9]+', '-', request.path).strip('-') or 'root'
+        name = f"{now:%Y%m%dT%H%M%S}-{request.method}-{path_slug}-{uuid.uuid4().hex[:8]}"
+
+        user = getattr(request, 'user', None)
+        metadata = {
+            'method': request.method,
+            'path': request.path,
+            'status_code': response.status_code,
+            'duration_ms': round(duration * 1000, 3),
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'reason': reason,
+            'timestamp': now.isoformat(),
+        }
+
+        # Ошибка записи профиля не должна ломать ответ
+        try:
+            profiler.dump_stats(self.output_dir / f"{name}.prof")
+            (self.output_dir / f"{name}.json").write_text(json.dumps(metadata, ensure_ascii=False))
+        except OSError:
+            logger.exception("Не удалось сохранить профиль запроса %s", request.path)
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.7 on 2026-10-19 17:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_role_closure(apps, schema_editor):
+    Role = apps.get_model('authapp', 'Role')
+    RoleClosure = apps.get_model('authapp', 'RoleClosure')
+    # Явная БД миграции: иначе роутер отправит чтение ролей на реплику
+    db_alias = schema_editor.connection.alias
+    RoleClosure.objects.using(db_alias).bulk_create(
+        RoleClosure(ancestor_id=role_id, descendant_id=role_id, depth=0)
+        for role_id in Role.objects.using(db_alias).values_list('id', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0002_user_groups_user_user_permissions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='role',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='authapp.role', verbose_name='Родительская роль'),
+        ),
+        migrations.CreateModel(
+            name='RoleClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='authapp.role')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='authapp.role')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roleclosure',
+            constraint=models.UniqueConstraint(fields=('descendant', 'ancestor'), name='unique_role_closure'),
+        ),
+        migrations.RunPython(populate_role_closure, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0003_role_parent_roleclosure'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='roles',
+            field=models.ManyToManyField(blank=True, related_name='members', to='authapp.role', verbose_name='Дополнительные роли'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-19 19:05
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+import authapp.indexes
+
+
+class Migration(migrations.Migration):
+    # Индексы строятся CONCURRENTLY, чтобы не блокировать запись в большую таблицу пользователей.
+    # На SQLite расширение и индексы пропускаются
+    atomic = False
+
+    dependencies = [
+        ('authapp', '0004_user_roles'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        authapp.indexes.PostgresAddIndexConcurrently(
+            model_name='user',
+            index=authapp.indexes.PostgresGinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+        ),
+        authapp.indexes.PostgresAddIndexConcurrently(
+            model_name='user',
+            index=authapp.indexes.PostgresGinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm'),
+        ),
+        authapp.indexes.PostgresAddIndexConcurrently(
+            model_name='user',
+            index=authapp.indexes.PostgresGinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm'),
+        ),
+        authapp.indexes.PostgresAddIndexConcurrently(
+            model_name='user',
+            index=authapp.indexes.PostgresIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='text_pattern_ops'), name='user_email_prefix'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-19 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0006_user_last_seen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceClient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=255, verbose_name='Название')),
+                ('client_id', models.CharField(max_length=64, unique=True, verbose_name='ID клиента')),
+                ('secret_hash', models.CharField(max_length=255, verbose_name='Хэш секрета')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активен')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='service_client', to=settings.AUTH_USER_MODEL, verbose_name='Сервисный пользователь')),
+            ],
+            options={
+                'verbose_name': 'Сервисный клиент',
+                'verbose_name_plural': 'Сервисные клиенты',
+            },
+        ),
+    ]
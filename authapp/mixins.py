@@ -0,0 +1,85 @@
+from typing import Optional, Any
+from django.db.models import QuerySet
+from rest_framework.response import Response
+
+from .permissions import HasPermission
+from .services.response_cache import ResponseCacheService
+
+
+class OwnerScopedQuerysetMixin:
+    # Проверка "свои / все" выполняется в SQL, а не по одному объекту в has_object_permission
+    owner_field = 'owner'
+
+    def get_queryset(self) -> QuerySet:
+        queryset = super().get_queryset()
+        user = self.request.user
+
+        permission = HasPermission()
+        rule = permission._get_access_rule(user, self)
+        scope = permission.get_owner_scope(rule, self.request.method)
+
+        if scope == HasPermission.SCOPE_ALL:
+            return queryset
+        if scope == HasPermission.SCOPE_OWN:
+            return queryset.filter(**{self.owner_field: user.pk})
+        return queryset.none()
+
+
+class _CachedResponse(Exception):
+    def __init__(self, response: Response) -> None:
+        self.response = response
+
+
+class PermissionScopedCacheMixin:
+    # Кэш GET-ответов после проверки прав: при праве "все" ответ общий для одинаковых прав на элемент,
+    # при праве "свои" - отдельный для каждого пользователя
+    response_cache_timeout: Optional[int] = None
+    # True для представлений, тело которых зависит от вызывающего: ответ кэшируется на пользователя при любой области
+    response_cache_per_user = False
+
+    def get_response_cache_key(self, request: Any) -> Optional[str]:
+        element_name = getattr(self, 'business_element', None)
+        if request.method != 'GET' or not element_name or not request.user.is_authenticated:
+            return None
+
+        permission = HasPermission()
+        rule = permission._get_access_rule(request.user, self)
+        scope = permission.get_owner_scope(rule, request.method)
+        if scope is None:
+            return None
+
+        if scope == HasPermission.SCOPE_OWN or self.response_cache_per_user:
+            principal = f'user:{request.user.pk}'
+        elif request.user.is_superuser:
+            principal = 'superuser'
+        elif rule is None:
+            principal = 'unrestricted'
+        else:
+            principal = f'bits:{rule.bits}'
+
+        return ResponseCacheService.get_cache_key(element_name, scope, principal, request.get_full_path())
+
+    def initial(self, request: Any, *args: Any, **kwargs: Any) -> None:
+        # Сначала аутентификация и HasPermission: без доступа до кэша дело не доходит
+        super().initial(request, *args, **kwargs)
+
+        self._response_cache_key = self.get_response_cache_key(request)
+        if self._response_cache_key is None:
+            return
+
+        cached = ResponseCacheService.get(self._response_cache_key)
+        if cached is not None:
+            status_code, data = cached
+            raise _CachedResponse(Response(data, status=status_code, headers={'X-Cache': 'HIT'}))
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, _CachedResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request: Any, response: Any, *args: Any, **kwargs: Any) -> Any:
+        cache_key = getattr(self, '_response_cache_key', None)
+        if cache_key and response.status_code == 200 and 'X-Cache' not in response and hasattr(response, 'data'):
+            ResponseCacheService.set(cache_key, response.status_code, response.data, self.response_cache_timeout)
+            response['X-Cache'] = 'MISS'
+        return super().finalize_response(request, response, *args, **kwargs)
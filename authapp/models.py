@@ -1,6 +1,11 @@
+from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from typing import Optional, Any
+from typing import Optional, Any, List
+
+from authapp.indexes import PostgresGinIndex, PostgresIndex
 
 
 class BaseModel(models.Model):
@@ -16,14 +21,45 @@ class BaseModel(models.Model):
 
 class Role(BaseModel):
     name = models.CharField(max_length=255, verbose_name='Название')
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='children',
+        verbose_name='Родительская роль'
+    )
 
     def __str__(self) -> str:
         return self.name
 
+    def would_create_cycle(self, parent_id: Optional[int]) -> bool:
+        if parent_id is None or self.pk is None:
+            return False
+        return RoleClosure.objects.filter(ancestor_id=self.pk, descendant_id=parent_id).exists()
+
+    def clean(self) -> None:
+        if self.would_create_cycle(self.parent_id):
+            raise ValidationError({'parent': 'Роль не может наследоваться от своей дочерней роли'})
+
     class Meta:
         verbose_name = 'Роль'
         verbose_name_plural = 'Роли'
 
+class RoleClosure(models.Model):
+    # Транзитивное замыкание иерархии ролей, включая связь роли с самой собой (depth=0)
+    ancestor = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Role, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['descendant', 'ancestor'],
+                name='unique_role_closure'
+                )
+        ]
+
 class BusinessElement(BaseModel):
     name = models.CharField(max_length=255, unique=True, verbose_name='Название')
     
@@ -77,8 +113,10 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     last_name = models.CharField(max_length=50, verbose_name='Фамилия')
     is_active = models.BooleanField(default=True, verbose_name='Активен')
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, null=True, verbose_name='Роль')
+    roles = models.ManyToManyField(Role, blank=True, related_name='members', verbose_name='Дополнительные роли')
     is_staff = models.BooleanField(default=False, verbose_name='Персонал')
     is_superuser = models.BooleanField(default=False, verbose_name='Суперпользователь')
+    last_seen = models.DateTimeField(null=True, blank=True, verbose_name='Последняя активность')
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
@@ -87,7 +125,14 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
 
     def soft_delete(self) -> None:
         self.is_active = False
-        self.save()
+        self.save(update_fields=['is_active', 'updated_at'])
+
+    def get_role_ids(self) -> List[int]:
+        # Основная роль и дополнительные роли; права по ним объединяются
+        role_ids = set(self.roles.values_list('id', flat=True))
+        if self.role_id is not None:
+            role_ids.add(self.role_id)
+        return sorted(role_ids)
 
     def has_perm(self, perm: str, obj: Optional[Any] = None) -> bool:
         return self.is_superuser or super().has_perm(perm, obj)
@@ -101,6 +146,33 @@ class User(AbstractBaseUser, PermissionsMixin, BaseModel):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            # Поиск в админке: icontains компилируется в UPPER(col) LIKE, поэтому индексы строятся по UPPER
+            PostgresGinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='user_email_trgm'),
+            PostgresGinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='user_first_name_trgm'),
+            PostgresGinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='user_last_name_trgm'),
+            PostgresIndex(OpClass(Upper('email'), name='text_pattern_ops'), name='user_email_prefix'),
+        ]
+
+class ServiceClient(BaseModel):
+    # Клиент для client credentials; права задаются ролью связанного сервисного пользователя
+    name = models.CharField(max_length=255, verbose_name='Название')
+    client_id = models.CharField(max_length=64, unique=True, verbose_name='ID клиента')
+    secret_hash = models.CharField(max_length=255, verbose_name='Хэш секрета')
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='service_client',
+        verbose_name='Сервисный пользователь'
+    )
+    is_active = models.BooleanField(default=True, verbose_name='Активен')
+
+    def __str__(self) -> str:
+        return self.name
+
+    class Meta:
+        verbose_name = 'Сервисный клиент'
+        verbose_name_plural = 'Сервисные клиенты'
 
 
 
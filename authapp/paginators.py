@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from typing import Optional
+
+
+class EstimatedCountPaginator(Paginator):
+    # На больших таблицах точный COUNT(*) без фильтров заменяется оценкой планировщика PostgreSQL
+    @cached_property
+    def count(self) -> int:
+        estimate = self._get_estimated_count()
+        if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return estimate
+        return super().count
+
+    def _get_estimated_count(self) -> Optional[int]:
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None or query.where:
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+
+        # reltuples = -1, пока таблица ни разу не анализировалась
+        if row is None or row[0] < 0:
+            return None
+        return row[0]
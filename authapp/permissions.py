@@ -1,67 +1,97 @@
 from typing import Optional, Any
 from rest_framework.permissions import BasePermission
-from .models import AccessRule, BusinessElement
+from .policy_evaluator import METHOD_TO_PERMISSION, PERMISSION_BITS
+from .services.permission_service import PermissionService
+
+
+class EffectiveAccessRule:
+    # Объединенные по иерархии ролей флаги AccessRule с тем же интерфейсом атрибутов
+    def __init__(self, bits: int) -> None:
+        self.bits = bits
+
+    def __getattr__(self, name: str) -> bool:
+        bit = PERMISSION_BITS.get(name)
+        if bit is None:
+            raise AttributeError(name)
+        return bool(self.bits & bit)
 
 
 class HasPermission(BasePermission):
-    def _get_access_rule(self, user: Any, view: Any) -> Optional[AccessRule]:
-        if user.is_superuser:
-            return None
-        
-        element_name = getattr(view, 'business_element', None)
-        if not element_name:
+    SCOPE_ALL = 'all'
+    SCOPE_OWN = 'own'
+
+    METHOD_TO_PERMISSION = METHOD_TO_PERMISSION
+
+    def _get_access_rule(self, user: Any, view: Any) -> Optional['EffectiveAccessRule']:
+        return self.get_element_rule(user, getattr(view, 'business_element', None))
+
+    def get_element_rule(self, user: Any, element_name: Optional[str]) -> Optional['EffectiveAccessRule']:
+        if user.is_superuser or not element_name:
             return None
-        
-        try:
-            element = BusinessElement.objects.get(name=element_name)
-            rule = AccessRule.objects.get(role=user.role, business_element=element)
-            return rule
-        except (BusinessElement.DoesNotExist, AccessRule.DoesNotExist):
+
+        bits = PermissionService.get_user_permissions(user).get(element_name)
+        if bits is None:
             return None
+        return EffectiveAccessRule(bits)
     
+    def get_owner_scope(self, rule: Optional['EffectiveAccessRule'], request_method: str) -> Optional[str]:
+        if rule is None:
+            return self.SCOPE_ALL
+
+        base_permission = self.METHOD_TO_PERMISSION.get(request_method)
+        if not base_permission:
+            return None
+
+        if getattr(rule, f'{base_permission}_all_permission', False):
+            return self.SCOPE_ALL
+
+        if getattr(rule, f'{base_permission}_permission', False):
+            return self.SCOPE_OWN
+
+        return None
+
     def _check_permission(
         self, 
-        rule: Optional[AccessRule], 
+        rule: Optional['EffectiveAccessRule'], 
         request_method: str, 
         check_owner: bool = False, 
         obj: Optional[Any] = None, 
         user: Optional[Any] = None
     ) -> bool:
-        if rule is None:
-            return True
-        
-        method_to_permission = {
-            'GET': 'read',
-            'POST': 'create',
-            'PUT': 'update',
-            'PATCH': 'update',
-            'DELETE': 'delete'
-        }
-
-        base_permission = method_to_permission.get(request_method)
-        if not base_permission:
+        scope = self.get_owner_scope(rule, request_method)
+        if scope is None:
             return False
-        
-        if getattr(rule, f'{base_permission}_all_permission', False):
-            return True
-        
-        if getattr(rule, f'{base_permission}_permission', False):
-            if check_owner and (hasattr(obj, 'owner') or isinstance(obj, dict)):
-                owner = obj.owner if hasattr(obj, 'owner') else obj.get('owner')
-                return owner == user.id
-            else:
-                return True
-        
-        return False
 
-    def has_permission(self, request: Any, view: Any) -> bool:
-        user = request.user
+        if scope == self.SCOPE_OWN and check_owner and (hasattr(obj, 'owner') or isinstance(obj, dict)):
+            owner = obj.owner if hasattr(obj, 'owner') else obj.get('owner')
+            return owner == user.id
 
+        return True
+
+    def has_element_permission(
+        self,
+        user: Any,
+        element_name: Optional[str],
+        request_method: str,
+        require_rule: bool = False
+    ) -> bool:
+        # Общая проверка для HasPermission и RouteAuthorizationMiddleware
         if not user.is_authenticated:
-                return False 
-        
-        rule = self._get_access_rule(user, view)
-        return self._check_permission(rule, request.method, check_owner=False)
+            return False
+
+        rule = self.get_element_rule(user, element_name)
+        # Для закрытых элементов отсутствие правила означает запрет, а не доступ без ограничений
+        if rule is None and require_rule and not user.is_superuser:
+            return False
+        return self._check_permission(rule, request_method)
+
+    def has_permission(self, request: Any, view: Any) -> bool:
+        return self.has_element_permission(
+            request.user,
+            getattr(view, 'business_element', None),
+            request.method,
+            require_rule=getattr(view, 'require_access_rule', False)
+        )
 
     def has_object_permission(self, request: Any, view: Any, obj: Any) -> bool:
         user = request.user
@@ -0,0 +1,145 @@
+# Автономный модуль без зависимостей от Django: его можно скопировать в sidecar
+# и принимать решения HasPermission по выгруженному бандлу политик.
+import json
+import struct
+from typing import Optional, Any, Dict, Iterable, Tuple, Union
+
+BUNDLE_FORMAT = 1
+BINARY_MAGIC = b'PBND'
+
+PERMISSION_FLAGS = (
+    'read_permission',
+    'read_all_permission',
+    'create_permission',
+    'update_permission',
+    'update_all_permission',
+    'delete_permission',
+    'delete_all_permission',
+)
+PERMISSION_BITS = {flag: 1 << index for index, flag in enumerate(PERMISSION_FLAGS)}
+
+METHOD_TO_PERMISSION = {
+    'GET': 'read',
+    'POST': 'create',
+    'PUT': 'update',
+    'PATCH': 'update',
+    'DELETE': 'delete'
+}
+
+
+def encode_binary(bundle: Dict[str, Any]) -> bytes:
+    version = bundle['version'].encode('ascii')
+    parts = [
+        BINARY_MAGIC,
+        struct.pack('<BB', bundle['format'], len(version)),
+        version,
+        struct.pack('<I', len(bundle['elements'])),
+    ]
+    for name in bundle['elements']:
+        encoded = name.encode('utf-8')
+        parts.append(struct.pack('<H', len(encoded)))
+        parts.append(encoded)
+
+    parts.append(struct.pack('<I', len(bundle['rules'])))
+    for role_id, element_index, bits in bundle['rules']:
+        parts.append(struct.pack('<QIB', role_id, element_index, bits))
+    return b''.join(parts)
+
+
+def decode_binary(data: bytes) -> Dict[str, Any]:
+    if data[:4] != BINARY_MAGIC:
+        raise ValueError("Неизвестный формат бандла")
+
+    offset = 4
+    bundle_format, version_length = struct.unpack_from('<BB', data, offset)
+    offset += 2
+    version = data[offset:offset + version_length].decode('ascii')
+    offset += version_length
+
+    (element_count,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    elements = []
+    for _ in range(element_count):
+        (length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        elements.append(data[offset:offset + length].decode('utf-8'))
+        offset += length
+
+    (rule_count,) = struct.unpack_from('<I', data, offset)
+    offset += 4
+    rules = []
+    for _ in range(rule_count):
+        rules.append(list(struct.unpack_from('<QIB', data, offset)))
+        offset += struct.calcsize('<QIB')
+
+    return {'format': bundle_format, 'version': version, 'elements': elements, 'rules': rules}
+
+
+class PolicyEvaluator:
+    def __init__(self, bundle: Dict[str, Any]) -> None:
+        if bundle['format'] != BUNDLE_FORMAT:
+            raise ValueError(f"Неподдерживаемая версия формата бандла: {bundle['format']}")
+
+        self.version = bundle['version']
+        elements = bundle['elements']
+        self._rules: Dict[Tuple[int, str], int] = {
+            (role_id, elements[element_index]): bits
+            for role_id, element_index, bits in bundle['rules']
+        }
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> 'PolicyEvaluator':
+        return cls(json.loads(data))
+
+    @classmethod
+    def from_binary(cls, data: bytes) -> 'PolicyEvaluator':
+        return cls(decode_binary(data))
+
+    def get_rule_bits(self, role_id: Optional[int], element_name: str) -> Optional[int]:
+        return self._rules.get((role_id, element_name))
+
+    def get_effective_bits(self, role_ids: Iterable[Optional[int]], element_name: str) -> Optional[int]:
+        # Права пользователя с несколькими ролями - OR флагов по всем ролям;
+        # если хотя бы у одной роли правила нет, элемент для пользователя не ограничен
+        effective = None
+        for role_id in role_ids:
+            bits = self._rules.get((role_id, element_name))
+            if bits is None:
+                return None
+            effective = (effective or 0) | bits
+        return effective
+
+    def check(
+        self,
+        role_id: Optional[int],
+        element_name: Optional[str],
+        request_method: str,
+        is_superuser: bool = False,
+        check_owner: bool = False,
+        obj: Optional[Any] = None,
+        user_id: Optional[int] = None,
+        role_ids: Optional[Iterable[int]] = None,
+        require_rule: bool = False
+    ) -> bool:
+        # Повторяет HasPermission: нет правила - доступ разрешен, если элемент не требует явного правила
+        if is_superuser or not element_name:
+            return True
+
+        bits = self.get_effective_bits(role_ids if role_ids is not None else [role_id], element_name)
+        if bits is None:
+            return not require_rule
+
+        base_permission = METHOD_TO_PERMISSION.get(request_method)
+        if not base_permission:
+            return False
+
+        if bits & PERMISSION_BITS.get(f'{base_permission}_all_permission', 0):
+            return True
+
+        if bits & PERMISSION_BITS.get(f'{base_permission}_permission', 0):
+            if check_owner and (hasattr(obj, 'owner') or isinstance(obj, dict)):
+                owner = obj.owner if hasattr(obj, 'owner') else obj.get('owner')
+                return owner == user_id
+            return True
+
+        return False
@@ -0,0 +1,58 @@
+import math
+from typing import Optional, Any
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен, без него работает стандартный рендерер
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    # orjson и json по-разному пишут экспоненту (1e16 и 1e+16), а NaN/Infinity orjson превращает в null,
+    # тогда как DRF выбрасывает ошибку; такие числа всегда рендерит JSONRenderer
+    _encoder = encoders.JSONEncoder()
+
+    @staticmethod
+    def _is_unsafe_float(value: float) -> bool:
+        return not math.isfinite(value) or 'e' in repr(value)
+
+    @classmethod
+    def _has_unsafe_float(cls, data: Any) -> bool:
+        if isinstance(data, float):
+            return cls._is_unsafe_float(data)
+        if isinstance(data, dict):
+            return any(cls._has_unsafe_float(value) for value in data.values())
+        if isinstance(data, (list, tuple)):
+            return any(cls._has_unsafe_float(value) for value in data)
+        return False
+
+    def _default(self, obj: Any) -> Any:
+        # Decimal и прочие типы DRF превращает во float уже здесь, в обход проверки данных
+        value = self._encoder.default(obj)
+        if isinstance(value, float) and self._is_unsafe_float(value):
+            raise TypeError("Число с плавающей точкой рендерится стандартным рендерером")
+        return value
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[dict] = None) -> bytes:
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self._has_unsafe_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Даты отдаются кодировщику DRF, чтобы формат совпадал байт в байт
+            ret = orjson.dumps(
+                data,
+                default=self._default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,42 +1,66 @@
 from typing import Any, Dict
+from django.conf import settings
 from django.contrib.auth.password_validation import validate_password
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from authapp.exceptions import InactiveUserError, InvalidCredentialsError
-from authapp.models import AccessRule, User, Role
+from authapp.models import AccessRule, BusinessElement, User, Role
+from authapp.policy_evaluator import PERMISSION_FLAGS
 from authapp.services.authentication import PasswordAuthentication
+from authapp.services.jwt_service import JWTService
 
 
 class UserRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
     password2 = serializers.CharField(write_only=True)
 
+    DUPLICATE_EMAIL_ERROR = "Пользователь с таким email уже существует"
+
     class Meta:
         model = User
         fields = ('email', 'first_name', 'last_name', 'password', 'password2', 'role')
+        # Уникальность проверяется в validate_email по нормализованному email
+        extra_kwargs = {'email': {'validators': []}}
+
+    def validate_email(self, value: str) -> str:
+        email = User.objects.normalize_email(value)
+        if User.objects.filter(email=email).exists():
+            raise serializers.ValidationError(self.DUPLICATE_EMAIL_ERROR)
+        return email
 
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Дешевые проверки идут первыми, хэширование пароля выполняется только для валидных данных
         password = data.get('password')
+        if password != data.get('password2'):
+            raise serializers.ValidationError({"password2": ["Пароли не совпадают"]})
+
         try:
             validate_password(password)
         except serializers.ValidationError as e:
             raise serializers.ValidationError({"password": e.messages})
         except Exception as e:
             raise serializers.ValidationError({"password": [str(e)]})
-       
-        if password != data.get('password2'):
-            raise serializers.ValidationError({"password2": ["Пароли не совпадают"]})
             
         return data
 
     def create(self, validated_data: Dict[str, Any]) -> User:
         validated_data.pop('password2')
         password = validated_data.pop('password')
-        user = User.objects.create_user(password=password, **validated_data)
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(password=password, **validated_data)
+        except IntegrityError:
+            # Параллельная регистрация с тем же email прошла между проверкой и вставкой
+            raise serializers.ValidationError({"email": [self.DUPLICATE_EMAIL_ERROR]})
         return user
 
 class UserLoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField()
+    token_mode = serializers.ChoiceField(
+        choices=[JWTService.TOKEN_MODE_JWT, JWTService.TOKEN_MODE_REFERENCE],
+        required=False
+    )
 
     def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
         try:
@@ -56,11 +80,22 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'email', 'first_name', 'last_name', 'role', 'is_active')
 
+class UserRolesSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'role', 'roles')
+        read_only_fields = ('id',)
+
 class RoleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Role
         fields = '__all__'
 
+    def validate_parent(self, value: Any) -> Any:
+        if self.instance is not None and value is not None and self.instance.would_create_cycle(value.pk):
+            raise serializers.ValidationError("Роль не может наследоваться от своей дочерней роли")
+        return value
+
 class AccessRuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = AccessRule
@@ -101,8 +136,85 @@ class LogoutSerializer(serializers.Serializer):
     refresh_token = serializers.CharField()
     message = serializers.CharField(read_only=True, default="Успешный выход из системы")
 
+class TokenRefreshSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField()
+    token_mode = serializers.ChoiceField(
+        choices=[JWTService.TOKEN_MODE_JWT, JWTService.TOKEN_MODE_REFERENCE],
+        required=False
+    )
+
 class TokenRefreshResponseSerializer(serializers.Serializer):
     access_token = serializers.CharField(read_only=True)
     token_type = serializers.CharField(read_only=True, default='bearer')
     expires_in = serializers.IntegerField(read_only=True)
     message = serializers.CharField(read_only=True, default="Токен обновлен")
+
+# Быстрые сериализаторы для ответов фиксированной формы, совпадают по выводу с DRF-версиями
+class FastUserSerializer:
+    @staticmethod
+    def to_representation(user: User) -> Dict[str, Any]:
+        return {
+            'id': user.id,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'role': user.role_id,
+            'is_active': user.is_active,
+        }
+
+class FastTokenPairSerializer:
+    @staticmethod
+    def to_representation(tokens: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'access_token': tokens['access_token'],
+            'refresh_token': tokens['refresh_token'],
+            'token_type': tokens.get('token_type', 'bearer'),
+            'expires_in': tokens['expires_in'],
+            'refresh_expires_in': tokens['refresh_expires_in'],
+        }
+
+class FastLoginResponseSerializer:
+    @staticmethod
+    def to_representation(user: User, tokens: Dict[str, Any], message: str = "Успешная авторизация") -> Dict[str, Any]:
+        return {
+            'user': FastUserSerializer.to_representation(user),
+            'tokens': FastTokenPairSerializer.to_representation(tokens),
+            'message': message,
+        }
+
+class TokenIntrospectSerializer(serializers.Serializer):
+    token = serializers.CharField()
+
+class TokenIntrospectBatchSerializer(serializers.Serializer):
+    tokens = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.INTROSPECTION_BATCH_MAX_SIZE
+    )
+
+class UserBulkActiveSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.USER_BULK_MAX_SIZE
+    )
+
+class AccessRuleChangeSerializer(serializers.Serializer):
+    role = serializers.PrimaryKeyRelatedField(queryset=Role.objects.all())
+    business_element = serializers.SlugRelatedField(slug_field='name', queryset=BusinessElement.objects.all())
+    delete = serializers.BooleanField(default=False)
+
+    def get_fields(self) -> Dict[str, Any]:
+        # Флаги необязательны: непереданные остаются как в текущем правиле
+        fields = super().get_fields()
+        for flag in PERMISSION_FLAGS:
+            fields[flag] = serializers.BooleanField(required=False)
+        return fields
+
+class PolicySimulationSerializer(serializers.Serializer):
+    changes = AccessRuleChangeSerializer(many=True, allow_empty=False)
+
+class ClientCredentialsSerializer(serializers.Serializer):
+    grant_type = serializers.ChoiceField(choices=['client_credentials'])
+    client_id = serializers.CharField()
+    client_secret = serializers.CharField()
@@ -1,5 +1,22 @@
 from .hasher import BcryptPasswordHasher
 from .authentication import PasswordAuthentication, JWTAuthentication
 from .jwt_service import JWTService
+from .introspection_service import TokenIntrospectionService
+from .user_service import UserService
+from .policy_bundle import PolicyBundleService
+from .permission_service import PermissionService
+from .role_hierarchy import RoleHierarchyService
+from .revocation_store import RevocationStore
+from .export_service import ExportService
+from .response_cache import ResponseCacheService
+from .activity_service import ActivityService
+from .policy_simulation import PolicySimulationService
+from .last_seen import LastSeenService
+from .client_credentials import ClientCredentialsService
 
-__all__ = ['BcryptPasswordHasher', 'PasswordAuthentication', 'JWTAuthentication', 'JWTService']
+__all__ = [
+    'BcryptPasswordHasher', 'PasswordAuthentication', 'JWTAuthentication', 'JWTService',
+    'TokenIntrospectionService', 'UserService', 'PolicyBundleService', 'PermissionService',
+    'RoleHierarchyService', 'RevocationStore', 'ExportService', 'ResponseCacheService',
+    'ActivityService', 'PolicySimulationService', 'LastSeenService', 'ClientCredentialsService'
+]
@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from typing import Optional, Any, Dict, List
+
+from authapp.exceptions import ActivityStoreUnavailable
+from authapp.services.circuit_breaker import CircuitBreaker
+
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityService:
+    # DAU/MAU в HyperLogLog (до 12 КБ на день при любом числе пользователей) и счетчики событий по окнам
+    EVENT_REQUEST = 'request'
+    EVENT_LOGIN = 'login'
+    EVENT_LOGIN_FAILED = 'login_failed'
+    EVENT_REFRESH = 'refresh'
+    EVENT_REFRESH_FAILED = 'refresh_failed'
+    EVENTS = (EVENT_REQUEST, EVENT_LOGIN, EVENT_LOGIN_FAILED, EVENT_REFRESH, EVENT_REFRESH_FAILED)
+
+    DAY_KEY_TTL = int(timedelta(days=31).total_seconds())
+    MINUTE_KEY_TTL = int(timedelta(hours=2).total_seconds())
+    HOUR_KEY_TTL = int(timedelta(days=8).total_seconds())
+    MAU_DAYS = 30
+
+    breaker = CircuitBreaker(
+        'activity',
+        failure_threshold=settings.REVOCATION_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.REVOCATION_BREAKER_RESET_TIMEOUT
+    )
+
+    @staticmethod
+    def _get_client() -> Optional[Any]:
+        # PFADD/PFCOUNT нет в API кэша Django, поэтому нужен клиент redis-py самого бэкенда
+        backend = getattr(cache, '_cache', None)
+        if not settings.ACTIVITY_TRACKING_ENABLED or not hasattr(backend, 'get_client'):
+            return None
+        return backend.get_client(write=True)
+
+    @staticmethod
+    def _day_key(moment: Any) -> str:
+        return cache.make_key(f"activity:users:{moment:%Y%m%d}")
+
+    @staticmethod
+    def _minute_key(event: str, moment: Any) -> str:
+        return cache.make_key(f"activity:{event}:m:{moment:%Y%m%d%H%M}")
+
+    @staticmethod
+    def _hour_key(event: str, moment: Any) -> str:
+        return cache.make_key(f"activity:{event}:h:{moment:%Y%m%d%H}")
+
+    @staticmethod
+    def record(event: str, user_id: Optional[Any] = None) -> None:
+        client = ActivityService._get_client()
+        if client is None:
+            return
+
+        now = timezone.now()
+        # Все команды уходят одним пайплайном: один сетевой обмен на запрос
+        pipeline = client.pipeline(transaction=False)
+        if user_id is not None:
+            day_key = ActivityService._day_key(now)
+            pipeline.pfadd(day_key, user_id)
+            pipeline.expire(day_key, ActivityService.DAY_KEY_TTL)
+
+        minute_key = ActivityService._minute_key(event, now)
+        hour_key = ActivityService._hour_key(event, now)
+        pipeline.incr(minute_key)
+        pipeline.expire(minute_key, ActivityService.MINUTE_KEY_TTL)
+        pipeline.incr(hour_key)
+        pipeline.expire(hour_key, ActivityService.HOUR_KEY_TTL)
+
+        try:
+            ActivityService.breaker.call(pipeline.execute)
+        except Exception:
+            # Аналитика не должна влиять на обработку запроса
+            logger.debug("Не удалось записать событие активности %s", event, exc_info=True)
+
+    @staticmethod
+    def _sum(values: List[Optional[bytes]]) -> int:
+        return sum(int(value) for value in values if value is not None)
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        client = ActivityService._get_client()
+        if client is None:
+            return {}
+
+        now = timezone.now()
+        days = [now - timedelta(days=offset) for offset in range(ActivityService.MAU_DAYS)]
+        minutes = [now - timedelta(minutes=offset) for offset in range(60)]
+        hours = [now - timedelta(hours=offset) for offset in range(24)]
+
+        pipeline = client.pipeline(transaction=False)
+        pipeline.pfcount(ActivityService._day_key(now))
+        # PFCOUNT по нескольким ключам считает объединение - уникальных пользователей за 30 дней
+        pipeline.pfcount(*[ActivityService._day_key(day) for day in days])
+        for event in ActivityService.EVENTS:
+            pipeline.mget([ActivityService._minute_key(event, minute) for minute in minutes])
+            pipeline.mget([ActivityService._hour_key(event, hour) for hour in hours])
+        try:
+            results = ActivityService.breaker.call(pipeline.execute)
+        except Exception as e:
+            logger.warning("Не удалось получить статистику активности из Redis", exc_info=True)
+            raise ActivityStoreUnavailable("Статистика активности временно недоступна") from e
+
+        dau, mau, counters = results[0], results[1], results[2:]
+        events = {}
+        for index, event in enumerate(ActivityService.EVENTS):
+            minute_values, hour_values = counters[2 * index], counters[2 * index + 1]
+            events[event] = {
+                'last_minute': ActivityService._sum(minute_values[:1]),
+                'last_5_minutes': ActivityService._sum(minute_values[:5]),
+                'last_hour': ActivityService._sum(minute_values),
+                'last_24_hours': ActivityService._sum(hour_values),
+            }
+
+        def failure_rate(success: str, failed: str) -> Optional[float]:
+            total = events[success]['last_hour'] + events[failed]['last_hour']
+            return round(events[failed]['last_hour'] / total, 4) if total else None
+
+        return {
+            'date': now.date().isoformat(),
+            'dau': dau,
+            'mau': mau,
+            'events': events,
+            'login_failure_rate': failure_rate(ActivityService.EVENT_LOGIN, ActivityService.EVENT_LOGIN_FAILED),
+            'refresh_failure_rate': failure_rate(ActivityService.EVENT_REFRESH, ActivityService.EVENT_REFRESH_FAILED),
+        }
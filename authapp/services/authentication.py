@@ -4,8 +4,12 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
 from rest_framework.request import Request
 
+from authapp import db_router
 from authapp.models import User
+from authapp.services.activity_service import ActivityService
 from authapp.services.jwt_service import JWTService
+from authapp.services.last_seen import LastSeenService
+from authapp.services.user_cache import UserSnapshotCache
 from authapp.exceptions import InvalidCredentialsError, InactiveUserError
 
 
@@ -57,6 +61,11 @@ class PasswordAuthentication:
 
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request: Request) -> Optional[tuple[User, str]]:
+        # RouteAuthorizationMiddleware уже аутентифицировала запрос до вызова view
+        authenticated = getattr(request._request, 'jwt_authentication', None)
+        if authenticated is not None:
+            return authenticated
+
         auth_header = request.headers.get('Authorization')
 
         if not auth_header or not isinstance(auth_header, str):
@@ -73,11 +82,19 @@ class JWTAuthentication(BaseAuthentication):
 
         user_id = payload.get('id')
         email = payload.get('email')
+        db_router.pin_if_recent_writer(user_id)
 
-        try:
-            user = User.objects.get(id=user_id, email=email, is_active=True)
-        except User.DoesNotExist:
+        user = UserSnapshotCache.get_user(user_id)
+        if user is None or not user.is_active or (email is not None and user.email != email):
             raise exceptions.AuthenticationFailed("Пользователь не найден или не активен")
-        
+
+        if JWTService.is_issued_before_revocation(payload, user.tokens_revoked_before):
+            raise exceptions.AuthenticationFailed("Токен отозван")
+
+        ActivityService.record(ActivityService.EVENT_REQUEST, user.pk)
+        LastSeenService.touch(user.pk)
+        if JWTService.is_in_renewal_window(payload):
+            # Новый токен выпускает TokenRenewalMiddleware; отметка ставится на HttpRequest, который она видит
+            request._request.token_renewal = (token, {**payload, 'email': user.email})
         return (user, token)
                 
@@ -0,0 +1,69 @@
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == self.STATE_CLOSED:
+                return
+
+            # После reset_timeout пропускается один пробный вызов, остальные отклоняются сразу
+            if self.state == self.STATE_OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.STATE_HALF_OPEN
+                return
+
+            raise CircuitOpenError(f"Circuit breaker '{self.name}' открыт")
+
+    def _on_success(self) -> None:
+        with self._lock:
+            if self.state != self.STATE_CLOSED:
+                logger.info("Circuit breaker '%s' закрыт", self.name)
+            self.state = self.STATE_CLOSED
+            self._failures = 0
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.STATE_OPEN:
+                    logger.warning("Circuit breaker '%s' открыт после %s ошибок", self.name, self._failures)
+                self.state = self.STATE_OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = self.STATE_CLOSED
+            self._failures = 0
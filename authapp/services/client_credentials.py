@@ -0,0 +1,139 @@
+import hashlib
+import hmac
+import secrets
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import transaction
+from django.utils import timezone
+from typing import Optional, Any, Dict, Tuple
+
+from authapp.models import Role, ServiceClient, User
+from authapp.services.jwt_service import JWTService
+from authapp.services.safe_cache import SafeCache
+from authapp.services.user_cache import UserSnapshotCache
+
+
+class ClientCredentialsService:
+    CLIENT_ID_PREFIX = 'svc_'
+    SERVICE_EMAIL_DOMAIN = 'service-accounts.invalid'
+
+    @staticmethod
+    def _get_client_key(client_id: str) -> str:
+        return f"service_client:{client_id}"
+
+    @staticmethod
+    def _get_token_key(digest: str) -> str:
+        return f"service_client_token:{digest}"
+
+    @staticmethod
+    def get_digest(client_id: str, client_secret: str) -> str:
+        # HMAC с SECRET_KEY: ключ кэша не раскрывает секрет и не подбирается без ключа
+        return hmac.new(
+            settings.SECRET_KEY.encode(),
+            f"{client_id}:{client_secret}".encode(),
+            hashlib.sha256
+        ).hexdigest()
+
+    @staticmethod
+    def create_client(name: str, role: Optional[Role] = None) -> Tuple[ServiceClient, str]:
+        client_id = f"{ClientCredentialsService.CLIENT_ID_PREFIX}{secrets.token_hex(8)}"
+        client_secret = secrets.token_urlsafe(32)
+
+        with transaction.atomic():
+            # Пароль сервисного пользователя непригоден, войти через LoginView им нельзя
+            user = User.objects.create_user(
+                email=f"{client_id}@{ClientCredentialsService.SERVICE_EMAIL_DOMAIN}",
+                password=None,
+                first_name=name[:50],
+                last_name='Service',
+                role=role
+            )
+            client = ServiceClient.objects.create(
+                name=name,
+                client_id=client_id,
+                secret_hash=make_password(client_secret),
+                user=user
+            )
+        return client, client_secret
+
+    @staticmethod
+    def rotate_secret(client: ServiceClient) -> str:
+        client_secret = secrets.token_urlsafe(32)
+        client.secret_hash = make_password(client_secret)
+        client.save(update_fields=['secret_hash', 'updated_at'])
+        return client_secret
+
+    @staticmethod
+    def invalidate(client_id: str) -> None:
+        SafeCache.invalidate_delete([ClientCredentialsService._get_client_key(client_id)])
+
+    @staticmethod
+    def _load_client(client_id: str) -> Optional[Dict[str, Any]]:
+        client = ServiceClient.objects.filter(client_id=client_id).values(
+            'user_id', 'user__email', 'secret_hash', 'is_active'
+        ).first()
+        if client is None:
+            return None
+        return {
+            'user_id': client['user_id'],
+            'email': client['user__email'],
+            'secret_hash': client['secret_hash'],
+            'is_active': client['is_active'],
+        }
+
+    @staticmethod
+    def issue_token(client_id: str, client_secret: str) -> Optional[Dict[str, Any]]:
+        digest = ClientCredentialsService.get_digest(client_id, client_secret)
+        client_key = ClientCredentialsService._get_client_key(client_id)
+        token_key = ClientCredentialsService._get_token_key(digest)
+        # При недоступном Redis клиент читается из БД, а секрет проверяется bcrypt
+        cached = SafeCache.get_many([client_key, token_key]) or {}
+
+        client = cached.get(client_key)
+        if client is None:
+            client = ClientCredentialsService._load_client(client_id)
+            if client is None:
+                return None
+            SafeCache.set(client_key, client, timeout=settings.SERVICE_CLIENT_CACHE_TTL)
+
+        if not client['is_active']:
+            return None
+        user = UserSnapshotCache.get_user(client['user_id'])
+        if user is None or not user.is_active:
+            return None
+
+        # Запись действительна, пока не сменился хэш секрета; иначе снова проверяется bcrypt
+        entry = cached.get(token_key)
+        if entry is None or entry['secret_hash'] != client['secret_hash']:
+            if not check_password(client_secret, client['secret_hash']):
+                return None
+            entry = None
+
+        now = timezone.now().timestamp()
+        lifetime = JWTService.ACCESS_TOKEN_EXPIRE_MINUTES.total_seconds()
+        # Выданный токен переиспользуется, пока у него осталось больше половины срока
+        if (
+            entry is not None
+            and entry['expires_at'] - now > lifetime / 2
+            and not JWTService.is_issued_before_revocation({'iat': entry['issued_at']}, user.tokens_revoked_before)
+        ):
+            access_token, expires_at = entry['access_token'], entry['expires_at']
+        else:
+            access_token = JWTService.generate_access_token({'id': user.pk, 'email': user.email})
+            expires_at = now + lifetime
+            SafeCache.set(
+                token_key,
+                {
+                    'secret_hash': client['secret_hash'],
+                    'access_token': access_token,
+                    'issued_at': now,
+                    'expires_at': expires_at,
+                },
+                timeout=settings.SERVICE_CLIENT_CACHE_TTL
+            )
+
+        return {
+            'access_token': access_token,
+            'token_type': 'bearer',
+            'expires_in': int(expires_at - now),
+        }
@@ -0,0 +1,123 @@
+import csv
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from authapp.models import AccessRule, Role, User
+from authapp.policy_evaluator import PERMISSION_FLAGS
+
+
+class _LineBuffer:
+    # csv.writer пишет строку в buffer и возвращает результат write, без накопления в памяти
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportService:
+    FORMAT_CSV = 'csv'
+    FORMAT_JSONL = 'jsonl'
+    FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+    CONTENT_TYPES = {
+        FORMAT_CSV: 'text/csv; charset=utf-8',
+        FORMAT_JSONL: 'application/x-ndjson',
+    }
+    CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+    # Колонка выгрузки -> поле values_list; имена связанных объектов берутся через JOIN
+    DATASETS: Dict[str, Tuple[Callable[[], QuerySet], Tuple[Tuple[str, str], ...]]] = {
+        'users': (
+            lambda: User.objects.order_by('id'),
+            (
+                ('id', 'id'),
+                ('email', 'email'),
+                ('first_name', 'first_name'),
+                ('last_name', 'last_name'),
+                ('role_id', 'role_id'),
+                ('role_name', 'role__name'),
+                ('is_active', 'is_active'),
+                ('is_staff', 'is_staff'),
+                ('is_superuser', 'is_superuser'),
+                ('last_login', 'last_login'),
+                ('last_seen', 'last_seen'),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            )
+        ),
+        'roles': (
+            lambda: Role.objects.order_by('id'),
+            (
+                ('id', 'id'),
+                ('name', 'name'),
+                ('parent_id', 'parent_id'),
+                ('parent_name', 'parent__name'),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            )
+        ),
+        'access-rules': (
+            lambda: AccessRule.objects.order_by('id'),
+            (
+                ('id', 'id'),
+                ('role_id', 'role_id'),
+                ('role_name', 'role__name'),
+                ('business_element_id', 'business_element_id'),
+                ('business_element_name', 'business_element__name'),
+                *((flag, flag) for flag in PERMISSION_FLAGS),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            )
+        ),
+    }
+
+    @staticmethod
+    def get_columns(dataset: str) -> Tuple[str, ...]:
+        return tuple(column for column, _ in ExportService.DATASETS[dataset][1])
+
+    @staticmethod
+    def iter_rows(dataset: str) -> Iterator[Tuple[Any, ...]]:
+        get_queryset, columns = ExportService.DATASETS[dataset]
+        # iterator() читает строки порциями и не заполняет кэш QuerySet
+        return get_queryset().values_list(
+            *(field for _, field in columns)
+        ).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+    @staticmethod
+    def _escape_csv_value(value: Any) -> Any:
+        # Табличные редакторы выполняют ячейку, начинающуюся с этих символов, как формулу
+        if isinstance(value, str) and value.startswith(ExportService.CSV_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    @staticmethod
+    def _iter_csv_lines(dataset: str) -> Iterator[str]:
+        writer = csv.writer(_LineBuffer())
+        escape = ExportService._escape_csv_value
+        yield writer.writerow(ExportService.get_columns(dataset))
+        for row in ExportService.iter_rows(dataset):
+            yield writer.writerow([escape(value) for value in row])
+
+    @staticmethod
+    def _iter_jsonl_lines(dataset: str) -> Iterator[str]:
+        columns = ExportService.get_columns(dataset)
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for row in ExportService.iter_rows(dataset):
+            yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+    @staticmethod
+    def stream(dataset: str, export_format: str) -> Iterator[str]:
+        lines = (
+            ExportService._iter_jsonl_lines(dataset)
+            if export_format == ExportService.FORMAT_JSONL
+            else ExportService._iter_csv_lines(dataset)
+        )
+
+        # Строки отдаются пачками, чтобы не делать отдельную запись в сокет на каждую строку
+        batch = []
+        for line in lines:
+            batch.append(line)
+            if len(batch) >= settings.EXPORT_CHUNK_SIZE:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
@@ -0,0 +1,119 @@
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from typing import Optional, Dict, Any, List
+
+from authapp.exceptions import RevocationStoreUnavailable
+from authapp.models import User
+from authapp.services.jwt_service import JWTService
+from authapp.services.revocation_store import RevocationStore
+from authapp.services.safe_cache import SafeCache
+
+
+class TokenIntrospectionService:
+    INACTIVE_RESPONSE = {'active': False}
+
+    @staticmethod
+    def _get_cache_key(token_hash: str) -> str:
+        return f"introspect:{token_hash}"
+
+    @staticmethod
+    def _get_user_version_key(user_id: Any) -> str:
+        return f"introspect:user:{user_id}"
+
+    @staticmethod
+    def invalidate_user(user_id: Any) -> None:
+        # Новая версия пользователя делает недействительными все закэшированные ответы по его токенам
+        SafeCache.invalidate_set(
+            TokenIntrospectionService._get_user_version_key(user_id),
+            uuid.uuid4().hex,
+            timeout=int(JWTService.REFRESH_TOKEN_EXPIRE_DAYS.total_seconds())
+        )
+
+    @staticmethod
+    def _build_response(payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'active': True,
+            'sub': str(payload.get('id')),
+            'email': payload.get('email'),
+            'token_type': payload.get('token_type'),
+            'exp': int(payload['exp']),
+            'iat': int(payload['iat']),
+        }
+
+    @staticmethod
+    def introspect(token: str) -> Dict[str, Any]:
+        return TokenIntrospectionService.introspect_many([token])[0]
+
+    @staticmethod
+    def introspect_many(tokens: List[str]) -> List[Dict[str, Any]]:
+        hashes = [JWTService.get_token_hash(token) for token in tokens]
+        unverified = [JWTService.decode_token(token) or {} for token in tokens]
+
+        # Один запрос к кэшу: закэшированные ответы, черный список и версии пользователей
+        keys = set()
+        for token, token_hash, claims in zip(tokens, hashes, unverified):
+            keys.add(TokenIntrospectionService._get_cache_key(token_hash))
+            keys.add(JWTService._get_cache_key(token))
+            if claims.get('id') is not None:
+                keys.add(TokenIntrospectionService._get_user_version_key(claims['id']))
+                keys.add(JWTService._get_user_revocation_key(claims['id']))
+        # Черный список и отметки отзыва читаются с той же политикой отказа, что и при аутентификации
+        unavailable = False
+        try:
+            cached = RevocationStore.get_many(list(keys))
+        except RevocationStoreUnavailable as e:
+            cached, unavailable = e.found, True
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(tokens)
+        pending = {}
+        for index, (token, token_hash, claims) in enumerate(zip(tokens, hashes, unverified)):
+            revoked_before = cached.get(JWTService._get_user_revocation_key(claims.get('id')))
+            if JWTService._get_cache_key(token) in cached or JWTService.is_issued_before_revocation(claims, revoked_before):
+                results[index] = dict(TokenIntrospectionService.INACTIVE_RESPONSE)
+                continue
+            if unavailable and RevocationStore.fail_closed():
+                results[index] = dict(TokenIntrospectionService.INACTIVE_RESPONSE)
+                continue
+
+            user_version = cached.get(TokenIntrospectionService._get_user_version_key(claims.get('id')))
+            entry = cached.get(TokenIntrospectionService._get_cache_key(token_hash))
+            if entry and entry['user_version'] == user_version:
+                results[index] = dict(entry['response'])
+                continue
+
+            payload = JWTService.verify_token(token)
+            if not payload or payload.get('exp') is None:
+                results[index] = dict(TokenIntrospectionService.INACTIVE_RESPONSE)
+                continue
+
+            pending[index] = (token_hash, payload, user_version)
+
+        active_emails = dict(
+            User.objects.filter(
+                id__in={payload.get('id') for _, payload, _ in pending.values()},
+                is_active=True
+            ).values_list('id', 'email')
+        ) if pending else {}
+
+        now = timezone.now().timestamp()
+        for index, (token_hash, payload, user_version) in pending.items():
+            user_id, email = payload.get('id'), payload.get('email')
+            # В токенах v2 email может отсутствовать
+            if user_id not in active_emails or (email is not None and active_emails[user_id] != email):
+                results[index] = dict(TokenIntrospectionService.INACTIVE_RESPONSE)
+                continue
+
+            response = TokenIntrospectionService._build_response(payload)
+            results[index] = response
+
+            # Ответ по reference-токену не кэшируется: удаление handle должно действовать сразу
+            ttl_seconds = int(payload['exp'] - now)
+            if ttl_seconds > 0 and not unavailable and not JWTService.is_reference_token(tokens[index]):
+                SafeCache.set(
+                    TokenIntrospectionService._get_cache_key(token_hash),
+                    {'response': response, 'user_version': user_version},
+                    timeout=min(ttl_seconds, settings.INTROSPECTION_CACHE_MAX_TTL)
+                )
+
+        return results
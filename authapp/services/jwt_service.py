@@ -1,40 +1,93 @@
 import jwt 
 import hashlib
 import json
+import logging
+import secrets
 from datetime import timedelta
-from django.core.cache import cache
 from django.utils import timezone
 from django.conf import settings
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from authapp.exceptions import TokenBlackListError
+from authapp.exceptions import RevocationStoreUnavailable, TokenBlackListError
+from authapp.services.revocation_store import RevocationStore
+from authapp.services.safe_cache import SafeCache
+
+
+logger = logging.getLogger(__name__)
 
 
 class JWTService:
     ACCESS_TOKEN_EXPIRE_MINUTES = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     REFRESH_TOKEN_EXPIRE_DAYS = timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
 
+    # Режим reference: клиент получает короткий случайный handle, claims хранятся в Redis
+    TOKEN_MODE_JWT = 'jwt'
+    TOKEN_MODE_REFERENCE = 'reference'
+    REFERENCE_TOKEN_PREFIX = 'rt_'
+
+    # Формат v2: целые метки времени, короткий код типа и необязательный email
+    TOKEN_TYPE_CODES = {'access': 'a', 'refresh': 'r'}
+    TOKEN_TYPES_BY_CODE = {code: token_type for token_type, code in TOKEN_TYPE_CODES.items()}
+
+    @staticmethod
+    def _build_payload(user_data: dict, token_type: str, expires_delta: timedelta, version: int) -> Dict[str, Any]:
+        now = timezone.now()
+        expire = now + expires_delta
+
+        if version == 2:
+            payload = {
+                'v': 2,
+                'id': user_data.get('id'),
+                't': JWTService.TOKEN_TYPE_CODES[token_type],
+                'exp': int(expire.timestamp()),
+                'iat': int(now.timestamp()),
+                # Доли секунды нужны для сравнения с отметкой отзыва, у которой точность выше секунды
+                'ms': now.microsecond // 1000
+            }
+            if settings.JWT_TOKEN_INCLUDE_EMAIL:
+                payload['email'] = user_data.get('email')
+            return payload
+
+        return {
+            'id': user_data.get('id'),
+            'email': user_data.get('email'),
+            'token_type': token_type,
+            'exp': expire.timestamp(),
+            'iat': now.timestamp()
+        }
+
+    @staticmethod
+    def _normalize_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+        # Токены v2 приводятся к виду v1, чтобы вызывающий код не зависел от формата
+        if payload.get('v') != 2:
+            return payload
+
+        return {
+            'id': payload.get('id'),
+            'email': payload.get('email'),
+            'token_type': JWTService.TOKEN_TYPES_BY_CODE.get(payload.get('t')),
+            'exp': payload.get('exp'),
+            'iat': payload.get('iat'),
+            'ms': payload.get('ms'),
+            'v': 2
+        }
+
     @staticmethod
     def _generate_token(
         user_data: dict, 
         token_type: str,
-        expires_delta: timedelta
+        expires_delta: timedelta,
+        version: Optional[int] = None
     ) -> str:
         if token_type not in ['access', 'refresh']:
             raise ValueError("Invalid token type. Allowed: 'access', 'refresh'")
-        payload = {
-            'id': user_data.get('id'),
-            'email': user_data.get('email'),
-            'token_type': token_type
-        }
         try:
-            expire = timezone.now() + expires_delta
-
-            token_payload = payload.copy()
-            token_payload.update({
-                'exp': expire.timestamp(),
-                'iat': timezone.now().timestamp()
-            })
+            token_payload = JWTService._build_payload(
+                user_data,
+                token_type,
+                expires_delta,
+                version or settings.JWT_TOKEN_VERSION
+            )
 
             token = jwt.encode(
                 token_payload,
@@ -47,13 +100,62 @@ class JWTService:
         except Exception as e:
             raise Exception(f"Ошибка генерации токена: {str(e)}")
     
+    @staticmethod
+    def is_reference_token(token: Optional[str]) -> bool:
+        return isinstance(token, str) and token.startswith(JWTService.REFERENCE_TOKEN_PREFIX)
+
+    @staticmethod
+    def _get_reference_key(token: str) -> str:
+        # В Redis хранится хэш handle, а не сам токен
+        return f"reftoken:{JWTService.get_token_hash(token)}"
+
+    @staticmethod
+    def _generate_reference_token(user_data: dict, token_type: str, expires_delta: timedelta) -> str:
+        payload = JWTService._normalize_payload(
+            JWTService._build_payload(user_data, token_type, expires_delta, settings.JWT_TOKEN_VERSION)
+        )
+        token = f"{JWTService.REFERENCE_TOKEN_PREFIX}{secrets.token_urlsafe(24)}"
+
+        if not SafeCache.set(JWTService._get_reference_key(token), payload, timeout=int(expires_delta.total_seconds())):
+            # Handle без записи в Redis не проверить, поэтому при сбое выдается обычный JWT
+            logger.warning("Redis недоступен, вместо reference-токена выдан JWT")
+            return JWTService._generate_token(user_data=user_data, token_type=token_type, expires_delta=expires_delta)
+        return token
+
+    @staticmethod
+    def _lookup_reference_token(token: str) -> Optional[Dict[str, Any]]:
+        # Без локального кэша: отзыв handle в одном процессе сразу действует во всех остальных.
+        # При недоступности Redis handle проверить нечем, и он не принимается
+        payload = SafeCache.get(JWTService._get_reference_key(token))
+        if payload is None:
+            return None
+
+        if payload.get('exp') is None or payload['exp'] <= timezone.now().timestamp():
+            return None
+        return dict(payload)
+
+    @staticmethod
+    def revoke_reference_token(token: str) -> None:
+        SafeCache.invalidate_delete([JWTService._get_reference_key(token)])
+
+    @staticmethod
+    def get_token_hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
     @staticmethod
     def _get_cache_key(token:str) -> str:
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = JWTService.get_token_hash(token)
         return f"blacklist:{token_hash}"
 
     @staticmethod
-    def generate_access_token(user_data: dict) -> str:
+    def generate_access_token(user_data: dict, token_mode: Optional[str] = None) -> str:
+        if (token_mode or settings.JWT_ACCESS_TOKEN_MODE) == JWTService.TOKEN_MODE_REFERENCE:
+            return JWTService._generate_reference_token(
+                user_data=user_data,
+                token_type='access',
+                expires_delta=JWTService.ACCESS_TOKEN_EXPIRE_MINUTES
+            )
+
         return JWTService._generate_token(
                 user_data=user_data,
                 token_type='access',
@@ -69,9 +171,9 @@ class JWTService:
              )
     
     @staticmethod
-    def generate_token_pair(user_data: dict) -> Dict[str, Any]:
+    def generate_token_pair(user_data: dict, token_mode: Optional[str] = None) -> Dict[str, Any]:
         try:
-            access_token = JWTService.generate_access_token(user_data)
+            access_token = JWTService.generate_access_token(user_data, token_mode)
             refresh_token = JWTService.generate_refresh_token(user_data)
 
             expires_in = JWTService.ACCESS_TOKEN_EXPIRE_MINUTES.total_seconds()
@@ -90,6 +192,9 @@ class JWTService:
 
     @staticmethod
     def verify_token(token: str) -> Optional[Dict[str, Any]]:
+        if JWTService.is_reference_token(token):
+            return JWTService._lookup_reference_token(token)
+
         try:
             payload = jwt.decode(
                 token,
@@ -106,7 +211,7 @@ class JWTService:
                 if timezone.now() > exp_datetime:
                     return None
             
-            return payload
+            return JWTService._normalize_payload(payload)
         
         except jwt.ExpiredSignatureError:
             return None
@@ -116,7 +221,7 @@ class JWTService:
             return None
     
     @staticmethod
-    def refresh_access_token(refresh_token: str) -> Optional[Dict[str, Any]]:
+    def refresh_access_token(refresh_token: str, token_mode: Optional[str] = None) -> Optional[Dict[str, Any]]:
         try:
             payload = JWTService.verify_token(refresh_token)
             if not payload:
@@ -124,26 +229,69 @@ class JWTService:
 
             if payload.get('token_type') != 'refresh':
                 return None
+
+            if JWTService.is_token_revoked(refresh_token, payload):
+                return None
             
             user_data = {
                 'id': payload.get('id'),
                 'email': payload.get('email')
             }
 
-            new_access_token = JWTService.generate_access_token(user_data)
+            new_access_token = JWTService.generate_access_token(user_data, token_mode)
             return new_access_token
         
         except Exception:
             return None
 
+    @staticmethod
+    def _get_renewal_key(token: str) -> str:
+        return f"renewal:{JWTService.get_token_hash(token)}"
+
+    @staticmethod
+    def is_in_renewal_window(payload: Dict[str, Any]) -> bool:
+        window = settings.JWT_SLIDING_RENEWAL_WINDOW
+        if not window or payload.get('token_type') != 'access' or payload.get('exp') is None:
+            return False
+        return payload['exp'] - timezone.now().timestamp() <= window
+
+    @staticmethod
+    def get_renewed_access_token(token: str, payload: Dict[str, Any]) -> Optional[str]:
+        # Обработчик мог отозвать токен (logout, удаление аккаунта), поэтому отзыв проверяется заново
+        if JWTService.is_reference_token(token):
+            if JWTService._lookup_reference_token(token) is None:
+                return None
+        elif JWTService.is_token_revoked(token, payload):
+            return None
+
+        # Один новый токен на старый: повторные запросы получают его из кэша без новой подписи
+        renewal_key = JWTService._get_renewal_key(token)
+        renewed = SafeCache.get(renewal_key)
+        if renewed is not None:
+            return renewed
+
+        token_mode = JWTService.TOKEN_MODE_REFERENCE if JWTService.is_reference_token(token) else JWTService.TOKEN_MODE_JWT
+        renewed = JWTService.generate_access_token(
+            {'id': payload.get('id'), 'email': payload.get('email')},
+            token_mode
+        )
+        # Старый токен бесполезен после истечения, поэтому запись живет до его exp
+        timeout = max(1, int(payload['exp'] - timezone.now().timestamp()))
+        if SafeCache.add(renewal_key, renewed, timeout=timeout) is False:
+            renewed = SafeCache.get(renewal_key) or renewed
+        return renewed
+
     @staticmethod
     def decode_token(token: str) -> Optional[Dict[str, Any]]:
+        if JWTService.is_reference_token(token):
+            return JWTService._lookup_reference_token(token)
+
         try:
             payload = jwt.decode(
                 token,
                 options={"verify_signature": False}
             )
-            return payload
+            return JWTService._normalize_payload(payload)
         except Exception:
             return None
     
@@ -155,7 +303,13 @@ class JWTService:
     @staticmethod
     def blacklist_refresh_token(token:str) -> bool:
         try:
-            if JWTService.is_token_blacklisted(token):
+            cache_key = JWTService._get_cache_key(token)
+            try:
+                already_blacklisted = cache_key in RevocationStore.get_many([cache_key])
+            except RevocationStoreUnavailable as e:
+                # Политика fail-closed не должна мешать logout: запись уйдет в резервное хранилище
+                already_blacklisted = cache_key in e.found
+            if already_blacklisted:
                 return False
                 
             payload = JWTService.verify_token(token)
@@ -174,35 +328,61 @@ class JWTService:
                 if ttl_seconds == 0:
                     return False
             else:
-                ttl_seconds = JWTService.REFRESH_TOKEN_EXPIRE_DAYS
+                ttl_seconds = int(JWTService.REFRESH_TOKEN_EXPIRE_DAYS.total_seconds())
 
-            cache_key = JWTService._get_cache_key(token)
             token_info = {
                 'blacklisted_at': timezone.now().isoformat(),
                 'token_type': payload.get('token_type', 'refresh'),
                 'user_id': payload.get('id')
             }
 
-            cache.set(cache_key, json.dumps(token_info), timeout=ttl_seconds)
+            RevocationStore.set(cache_key, json.dumps(token_info), timeout=ttl_seconds)
             return True
         except TokenBlackListError:
             return False
 
     @staticmethod
     def is_token_blacklisted(token: str) -> bool:
+        cache_key = JWTService._get_cache_key(token)
         try:
-            cache_key = JWTService._get_cache_key(token)
-            return cache.get(cache_key) is not None
-        except TokenBlackListError:
-            return False
-
-
-
-
-
+            return cache_key in RevocationStore.get_many([cache_key])
+        except RevocationStoreUnavailable as e:
+            return cache_key in e.found or RevocationStore.fail_closed()
 
+    @staticmethod
+    def _get_user_revocation_key(user_id: Any) -> str:
+        return f"revoked_before:{user_id}"
 
-        
+    @staticmethod
+    def revoke_user_tokens(user_ids: List[Any]) -> None:
+        # Все токены пользователя, выпущенные до этого момента, считаются отозванными; запись одним пайплайном
+        revoked_at = timezone.now().timestamp()
+        RevocationStore.set_many(
+            {JWTService._get_user_revocation_key(user_id): revoked_at for user_id in user_ids},
+            timeout=int(JWTService.REFRESH_TOKEN_EXPIRE_DAYS.total_seconds())
+        )
 
+    @staticmethod
+    def is_issued_before_revocation(payload: Dict[str, Any], revoked_before: Optional[float]) -> bool:
+        if revoked_before is None:
+            return False
+        issued_at = payload.get('iat', 0)
+        if payload.get('ms') is not None:
+            # Время выпуска v2 округлено вниз до миллисекунды, поэтому сомнительный случай решается в пользу отзыва
+            issued_at += payload['ms'] / 1000
+        return issued_at <= revoked_before
 
+    @staticmethod
+    def is_token_revoked(token: str, payload: Dict[str, Any]) -> bool:
+        blacklist_key = JWTService._get_cache_key(token)
+        revocation_key = JWTService._get_user_revocation_key(payload.get('id'))
+        unavailable = False
+        try:
+            cached = RevocationStore.get_many([blacklist_key, revocation_key])
+        except RevocationStoreUnavailable as e:
+            cached, unavailable = e.found, True
 
+        if blacklist_key in cached or JWTService.is_issued_before_revocation(payload, cached.get(revocation_key)):
+            return True
+        # Без ответа Redis решение зависит от политики REVOCATION_FAIL_MODE
+        return unavailable and RevocationStore.fail_closed()
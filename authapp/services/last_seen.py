@@ -0,0 +1,147 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from typing import Optional, Any, Dict, List, Tuple
+
+from authapp.models import User
+
+
+logger = logging.getLogger(__name__)
+
+
+class LastSeenService:
+    # Время активности копится в памяти процесса и пишется в БД одним UPDATE на пачку пользователей
+    FIELD_LAST_SEEN = 'last_seen'
+    FIELD_LAST_LOGIN = 'last_login'
+    FIELDS = (FIELD_LAST_SEEN, FIELD_LAST_LOGIN)
+
+    _lock = threading.Lock()
+    _buffer: Dict[Any, Dict[str, datetime]] = {}
+    _last_flush = time.monotonic()
+    _flusher: Optional[threading.Thread] = None
+
+    @staticmethod
+    def touch(user_id: Any, *fields: str, moment: Optional[datetime] = None) -> None:
+        # Повторные обращения одного пользователя схлопываются в одну запись с последним временем
+        moment = moment or timezone.now()
+        with LastSeenService._lock:
+            entry = LastSeenService._buffer.setdefault(user_id, {})
+            for field in fields or (LastSeenService.FIELD_LAST_SEEN,):
+                entry[field] = moment
+            LastSeenService._ensure_flusher()
+
+    @staticmethod
+    def _ensure_flusher() -> None:
+        # Фоновый поток сбрасывает буфер процесса, который перестал получать запросы и не видит request_finished.
+        # Запускается лениво и заново после fork: в дочернем процессе поток родителя не работает
+        flusher = LastSeenService._flusher
+        if flusher is not None and flusher.is_alive():
+            return
+        LastSeenService._flusher = threading.Thread(
+            target=LastSeenService._run_flusher, name='last-seen-flusher', daemon=True
+        )
+        LastSeenService._flusher.start()
+
+    @staticmethod
+    def _run_flusher() -> None:
+        while True:
+            time.sleep(max(settings.LAST_SEEN_FLUSH_INTERVAL, 1))
+            if not LastSeenService.is_flush_due():
+                continue
+            try:
+                LastSeenService.flush()
+            except Exception:
+                logger.exception("Ошибка фоновой записи времени активности")
+            finally:
+                # Соединение потока не обслуживается request_finished, поэтому закрывается здесь
+                connections.close_all()
+
+    @staticmethod
+    def is_flush_due() -> bool:
+        if not LastSeenService._buffer:
+            return False
+        return (
+            len(LastSeenService._buffer) >= settings.LAST_SEEN_FLUSH_BATCH_SIZE
+            or time.monotonic() - LastSeenService._last_flush >= settings.LAST_SEEN_FLUSH_INTERVAL
+        )
+
+    @staticmethod
+    def flush() -> int:
+        with LastSeenService._lock:
+            pending = LastSeenService._buffer
+            LastSeenService._buffer = {}
+            LastSeenService._last_flush = time.monotonic()
+
+        if not pending:
+            return 0
+
+        rows = sorted(pending.items())
+        batch_size = settings.LAST_SEEN_FLUSH_BATCH_SIZE
+        try:
+            for offset in range(0, len(rows), batch_size):
+                LastSeenService._write_batch(rows[offset:offset + batch_size])
+        except DatabaseError:
+            # Записи возвращаются в буфер и уйдут со следующей пачкой; GREATEST делает повтор безопасным
+            LastSeenService._restore(pending)
+            logger.warning("Не удалось записать время активности пользователей", exc_info=True)
+            return 0
+        return len(rows)
+
+    @staticmethod
+    def _restore(pending: Dict[Any, Dict[str, datetime]]) -> None:
+        with LastSeenService._lock:
+            for user_id, values in pending.items():
+                entry = LastSeenService._buffer.setdefault(user_id, {})
+                for field, moment in values.items():
+                    if field not in entry or entry[field] < moment:
+                        entry[field] = moment
+
+    @staticmethod
+    def _latest(field: str, moment: datetime) -> Greatest:
+        value = Value(moment, output_field=DateTimeField())
+        return Greatest(Coalesce(field, value), value)
+
+    @staticmethod
+    def _write_batch(rows: List[Tuple[Any, Dict[str, datetime]]]) -> None:
+        using = router.db_for_write(User)
+        connection = connections[using]
+
+        if connection.vendor != 'postgresql':
+            # Без UPDATE ... FROM (VALUES ...) пишем bulk_update: один CASE-запрос на поле.
+            # Как и GREATEST ниже, COALESCE(MAX) не дает записать более раннее время поверх позднего
+            for field in LastSeenService.FIELDS:
+                users = [
+                    User(pk=user_id, **{field: LastSeenService._latest(field, values[field])})
+                    for user_id, values in rows if field in values
+                ]
+                if users:
+                    User.objects.using(using).bulk_update(users, [field])
+            return
+
+        quote = connection.ops.quote_name
+        table = quote(User._meta.db_table)
+        columns = [quote(field) for field in LastSeenService.FIELDS]
+        values_sql = ', '.join(
+            ['(%s::bigint' + ', %s::timestamptz' * len(columns) + ')'] * len(rows)
+        )
+        # GREATEST пропускает NULL и не дает перезаписать более позднее время более ранним
+        assignments = ', '.join(f'{column} = GREATEST(u.{column}, v.{column})' for column in columns)
+        params = [
+            value
+            for user_id, values in rows
+            for value in (user_id, *(values.get(field) for field in LastSeenService.FIELDS))
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS u SET {assignments} '
+                f'FROM (VALUES {values_sql}) AS v(id, {", ".join(columns)}) '
+                f'WHERE u.id = v.id',
+                params
+            )
@@ -0,0 +1,131 @@
+import uuid
+from collections import defaultdict
+from django.conf import settings
+from typing import Optional, Any, Dict, Iterable, Tuple
+
+from authapp.models import AccessRule, RoleClosure
+from authapp.policy_evaluator import PERMISSION_BITS, PERMISSION_FLAGS
+from authapp.services.local_cache import LocalTTLCache
+from authapp.services.safe_cache import SafeCache
+
+
+class PermissionService:
+    GENERATION_KEY = 'permissions:generation'
+
+    _local_users = LocalTTLCache(
+        max_size=settings.USER_CACHE_LOCAL_MAX_SIZE,
+        ttl=settings.PERMISSION_CACHE_LOCAL_TTL
+    )
+
+    @staticmethod
+    def _get_user_cache_key(user_id: Any) -> str:
+        return f"user_permissions:{user_id}"
+
+    @staticmethod
+    def flags_to_bits(flags: Iterable[bool]) -> int:
+        bits = 0
+        for flag, value in zip(PERMISSION_FLAGS, flags):
+            if value:
+                bits |= PERMISSION_BITS[flag]
+        return bits
+
+    @staticmethod
+    def compute_effective_permissions(
+        rules: Iterable[Tuple[int, str, int]],
+        closure: Iterable[Tuple[int, int]]
+    ) -> Dict[int, Dict[str, int]]:
+        # Права роли - объединение правил всех ее предков, включая саму роль
+        rules_by_role: Dict[int, Dict[str, int]] = defaultdict(dict)
+        for role_id, element_name, bits in rules:
+            rules_by_role[role_id][element_name] = bits
+
+        effective: Dict[int, Dict[str, int]] = defaultdict(dict)
+        for ancestor_id, descendant_id in closure:
+            role_permissions = effective[descendant_id]
+            for element_name, bits in rules_by_role.get(ancestor_id, {}).items():
+                role_permissions[element_name] = role_permissions.get(element_name, 0) | bits
+        return effective
+
+    @staticmethod
+    def load_all_role_permissions(using: Optional[str] = None) -> Dict[int, Dict[str, int]]:
+        rules = (
+            (role_id, element_name, PermissionService.flags_to_bits(flags))
+            for role_id, element_name, *flags in AccessRule.objects.using(using).values_list(
+                'role_id', 'business_element__name', *PERMISSION_FLAGS
+            )
+        )
+        closure = RoleClosure.objects.using(using).values_list('ancestor_id', 'descendant_id')
+        return PermissionService.compute_effective_permissions(rules, closure)
+
+    @staticmethod
+    def combine_role_permissions(effective: Dict[int, Dict[str, int]], role_ids: Iterable[Any]) -> Dict[str, int]:
+        # Роль без правила для элемента его не ограничивает, поэтому ограничение остается,
+        # только если правило есть у каждой роли; флаги таких правил объединяются через OR
+        permissions: Optional[Dict[str, int]] = None
+        for role_id in role_ids:
+            role_permissions = effective.get(role_id, {})
+            if permissions is None:
+                permissions = dict(role_permissions)
+            else:
+                permissions = {
+                    element_name: bits | role_permissions[element_name]
+                    for element_name, bits in permissions.items()
+                    if element_name in role_permissions
+                }
+        return permissions or {}
+
+    @staticmethod
+    def load_roles_permissions(role_ids: Iterable[Any]) -> Dict[str, int]:
+        role_ids = list(role_ids)
+        closure = list(RoleClosure.objects.filter(descendant_id__in=role_ids).values_list('ancestor_id', 'descendant_id'))
+        rules = (
+            (role_id, element_name, PermissionService.flags_to_bits(flags))
+            for role_id, element_name, *flags in AccessRule.objects.filter(
+                role_id__in={ancestor_id for ancestor_id, _ in closure}
+            ).values_list('role_id', 'business_element__name', *PERMISSION_FLAGS)
+        )
+        effective = PermissionService.compute_effective_permissions(rules, closure)
+        return PermissionService.combine_role_permissions(effective, role_ids)
+
+    @staticmethod
+    def get_user_permissions(user: Any) -> Dict[str, int]:
+        # Права по всем ролям пользователя объединяются один раз и кэшируются на пользователя
+        permissions = PermissionService._local_users.get(user.pk)
+        if permissions is not None:
+            return permissions
+
+        cache_key = PermissionService._get_user_cache_key(user.pk)
+        cached = SafeCache.get_many([cache_key, PermissionService.GENERATION_KEY])
+        if cached is None:
+            # Redis недоступен: права читаются из БД без записи в кэш
+            role_ids = user.get_role_ids()
+            return PermissionService.load_roles_permissions(role_ids) if role_ids else {}
+
+        generation = cached.get(PermissionService.GENERATION_KEY)
+        entry = cached.get(cache_key)
+
+        if entry and entry['generation'] == generation:
+            permissions = entry['permissions']
+        else:
+            role_ids = user.get_role_ids()
+            permissions = PermissionService.load_roles_permissions(role_ids) if role_ids else {}
+            SafeCache.set(
+                cache_key,
+                {'permissions': permissions, 'generation': generation},
+                timeout=settings.PERMISSION_CACHE_TTL
+            )
+
+        PermissionService._local_users.set(user.pk, permissions)
+        return permissions
+
+    @staticmethod
+    def invalidate_users(user_ids: Iterable[Any]) -> None:
+        user_ids = list(user_ids)
+        for user_id in user_ids:
+            PermissionService._local_users.delete(user_id)
+        SafeCache.invalidate_delete([PermissionService._get_user_cache_key(user_id) for user_id in user_ids])
+
+    @staticmethod
+    def invalidate() -> None:
+        PermissionService._local_users.clear()
+        SafeCache.invalidate_set(PermissionService.GENERATION_KEY, uuid.uuid4().hex, timeout=None)
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import uuid
+from django.utils import timezone
+from typing import Dict, Any
+
+from authapp.models import BusinessElement
+from authapp.policy_evaluator import BUNDLE_FORMAT, PERMISSION_FLAGS, encode_binary
+from authapp.services.permission_service import PermissionService
+from authapp.services.safe_cache import SafeCache
+
+
+class PolicyBundleService:
+    CACHE_KEY = 'policy_bundle'
+    GENERATION_KEY = 'policy_bundle:generation'
+
+    @staticmethod
+    def build() -> Dict[str, Any]:
+        # Бандл кэшируется без срока, поэтому читается с primary, а не с отстающей реплики
+        elements = list(BusinessElement.objects.using('default').order_by('name').values_list('name', flat=True))
+        element_index = {name: index for index, name in enumerate(elements)}
+
+        # В бандл попадают эффективные права с учетом иерархии ролей
+        rules = [
+            [role_id, element_index[element_name], bits]
+            for role_id, permissions in sorted(PermissionService.load_all_role_permissions(using='default').items())
+            for element_name, bits in sorted(permissions.items())
+        ]
+
+        # Версия зависит только от содержимого, поэтому ETag не меняется без изменения правил
+        content = json.dumps([elements, rules], separators=(',', ':'), ensure_ascii=False)
+        version = hashlib.sha256(content.encode('utf-8')).hexdigest()[:32]
+
+        return {
+            'format': BUNDLE_FORMAT,
+            'version': version,
+            'generated_at': timezone.now().isoformat(),
+            'permissions': list(PERMISSION_FLAGS),
+            'elements': elements,
+            'rules': rules,
+        }
+
+    @staticmethod
+    def _encode(bundle: Dict[str, Any], generation: Any) -> Dict[str, Any]:
+        return {
+            'version': bundle['version'],
+            'json': json.dumps(bundle, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+            'binary': encode_binary(bundle),
+            'generation': generation,
+        }
+
+    @staticmethod
+    def get_bundle() -> Dict[str, Any]:
+        cached = SafeCache.get_many([PolicyBundleService.CACHE_KEY, PolicyBundleService.GENERATION_KEY])
+        if cached is None:
+            return PolicyBundleService._encode(PolicyBundleService.build(), None)
+
+        # Поколение читается до сборки: бандл, собранный до инвалидации, не попадет в кэш под новым поколением
+        generation = cached.get(PolicyBundleService.GENERATION_KEY)
+        entry = cached.get(PolicyBundleService.CACHE_KEY)
+        if entry is not None and entry.get('generation') == generation:
+            return entry
+
+        entry = PolicyBundleService._encode(PolicyBundleService.build(), generation)
+        if SafeCache.get(PolicyBundleService.GENERATION_KEY) == generation:
+            SafeCache.set(PolicyBundleService.CACHE_KEY, entry, timeout=None)
+        return entry
+
+    @staticmethod
+    def invalidate() -> None:
+        SafeCache.invalidate_set(PolicyBundleService.GENERATION_KEY, uuid.uuid4().hex, timeout=None)
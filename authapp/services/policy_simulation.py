@@ -0,0 +1,162 @@
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connections
+from django.db.models import Count, OuterRef, Subquery
+from typing import Optional, Any, Dict, Iterable, List, Tuple
+
+from authapp.models import AccessRule, BusinessElement, Role, RoleClosure, User
+from authapp.permissions import EffectiveAccessRule, HasPermission
+from authapp.policy_evaluator import METHOD_TO_PERMISSION, PERMISSION_BITS, PERMISSION_FLAGS
+from authapp.services.permission_service import PermissionService
+
+
+class PolicySimulationService:
+    DECISION_DENY = 'deny'
+
+    @staticmethod
+    def _load_rules() -> Dict[Tuple[int, str], int]:
+        return {
+            (role_id, element_name): PermissionService.flags_to_bits(flags)
+            for role_id, element_name, *flags in AccessRule.objects.values_list(
+                'role_id', 'business_element__name', *PERMISSION_FLAGS
+            )
+        }
+
+    @staticmethod
+    def apply_changes(rules: Dict[Tuple[int, str], int], changes: Iterable[Dict[str, Any]]) -> Dict[Tuple[int, str], int]:
+        # Изменение задает только переданные флаги, остальные берутся из текущего правила
+        proposed = dict(rules)
+        for change in changes:
+            key = (change['role'].pk, change['business_element'].name)
+            if change.get('delete'):
+                proposed.pop(key, None)
+                continue
+
+            bits = proposed.get(key, 0)
+            for flag in PERMISSION_FLAGS:
+                if flag in change:
+                    bits = bits | PERMISSION_BITS[flag] if change[flag] else bits & ~PERMISSION_BITS[flag]
+            proposed[key] = bits
+        return proposed
+
+    @staticmethod
+    def decide(bits: Optional[int], method: str) -> str:
+        # То же решение, что у HasPermission: нет правила - доступ ко всему
+        rule = EffectiveAccessRule(bits) if bits is not None else None
+        return HasPermission().get_owner_scope(rule, method) or PolicySimulationService.DECISION_DENY
+
+    @staticmethod
+    def _add_role_set(counts: Dict[Tuple[int, ...], int], primary_role_id: Optional[int], role_ids: Iterable[int], users: int) -> None:
+        role_set = set(role_ids)
+        if primary_role_id is not None:
+            role_set.add(primary_role_id)
+        counts[tuple(sorted(role_set))] += users
+
+    @staticmethod
+    def count_users_by_role_set() -> Dict[Tuple[int, ...], int]:
+        users = User.objects.filter(is_active=True, is_superuser=False)
+        counts: Dict[Tuple[int, ...], int] = defaultdict(int)
+
+        if connections[users.db].vendor == 'postgresql':
+            # Один GROUP BY по (основная роль, массив дополнительных ролей) вместо обхода пользователей
+            additional_roles = User.roles.through.objects.filter(
+                user_id=OuterRef('pk')
+            ).values('user_id').annotate(
+                role_ids=ArrayAgg('role_id', ordering='role_id')
+            ).values('role_ids')
+
+            rows = users.annotate(
+                additional_role_ids=Subquery(additional_roles)
+            ).values('role_id', 'additional_role_ids').annotate(users=Count('id')).order_by()
+            for row in rows:
+                PolicySimulationService._add_role_set(counts, row['role_id'], row['additional_role_ids'] or [], row['users'])
+            return counts
+
+        # Без ArrayAgg: пользователи без дополнительных ролей считаются GROUP BY по основной роли,
+        # остальные собираются из связей, прочитанных потоком в порядке user_id
+        rows = users.filter(roles__isnull=True).values('role_id').annotate(users=Count('id')).order_by()
+        for row in rows:
+            PolicySimulationService._add_role_set(counts, row['role_id'], [], row['users'])
+
+        memberships = User.roles.through.objects.filter(user__in=users).order_by('user_id').values_list(
+            'user_id', 'user__role_id', 'role_id'
+        ).iterator()
+        for _, group in groupby(memberships, key=itemgetter(0)):
+            group = list(group)
+            PolicySimulationService._add_role_set(counts, group[0][1], [role_id for _, _, role_id in group], 1)
+        return counts
+
+    @staticmethod
+    def _combine(permissions: Dict[int, Dict[str, int]], role_ids: Tuple[int, ...], element_name: str) -> Optional[int]:
+        # Как в PermissionService.combine_role_permissions: роль без правила снимает ограничение
+        bits = None
+        for role_id in role_ids:
+            role_bits = permissions.get(role_id, {}).get(element_name)
+            if role_bits is None:
+                return None
+            bits = (bits or 0) | role_bits
+        return bits
+
+    @staticmethod
+    def simulate(changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        rules = PolicySimulationService._load_rules()
+        proposed = PolicySimulationService.apply_changes(rules, changes)
+
+        closure = list(RoleClosure.objects.values_list('ancestor_id', 'descendant_id'))
+        old = PermissionService.compute_effective_permissions(
+            ((role_id, element, bits) for (role_id, element), bits in rules.items()), closure
+        )
+        new = PermissionService.compute_effective_permissions(
+            ((role_id, element, bits) for (role_id, element), bits in proposed.items()), closure
+        )
+
+        roles = dict(Role.objects.values_list('id', 'name'))
+        elements = list(BusinessElement.objects.order_by('name').values_list('name', flat=True))
+        methods = list(METHOD_TO_PERMISSION)
+
+        role_flips = []
+        for role_id in sorted(roles):
+            for element_name in elements:
+                for method in methods:
+                    before = PolicySimulationService.decide(old.get(role_id, {}).get(element_name), method)
+                    after = PolicySimulationService.decide(new.get(role_id, {}).get(element_name), method)
+                    if before != after:
+                        role_flips.append({
+                            'role_id': role_id,
+                            'role': roles[role_id],
+                            'business_element': element_name,
+                            'method': method,
+                            'old': before,
+                            'new': after,
+                        })
+
+        # Пользователь с несколькими ролями получает OR прав, поэтому решения считаются по наборам ролей
+        user_flips: Dict[Tuple[str, str, str, str], int] = defaultdict(int)
+        affected_users = 0
+        changed_elements = sorted({flip['business_element'] for flip in role_flips})
+        for role_ids, users in PolicySimulationService.count_users_by_role_set().items():
+            affected = False
+            for element_name in changed_elements:
+                old_bits = PolicySimulationService._combine(old, role_ids, element_name)
+                new_bits = PolicySimulationService._combine(new, role_ids, element_name)
+                for method in methods:
+                    before = PolicySimulationService.decide(old_bits, method)
+                    after = PolicySimulationService.decide(new_bits, method)
+                    if before != after:
+                        user_flips[(element_name, method, before, after)] += users
+                        affected = True
+            if affected:
+                affected_users += users
+
+        return {
+            'evaluated_combinations': len(roles) * len(elements) * len(methods),
+            'affected_business_elements': changed_elements,
+            'affected_users': affected_users,
+            'role_decision_changes': role_flips,
+            'user_decision_changes': [
+                {'business_element': element, 'method': method, 'old': before, 'new': after, 'users': users}
+                for (element, method, before, after), users in sorted(user_flips.items())
+            ],
+        }
@@ -0,0 +1,37 @@
+import uuid
+from django.conf import settings
+from typing import Optional, Any, Tuple
+
+from authapp.services.safe_cache import SafeCache
+
+
+class ResponseCacheService:
+    @staticmethod
+    def _get_version_key(element_name: str) -> str:
+        return f"response_cache:version:{element_name}"
+
+    @staticmethod
+    def get_cache_key(element_name: str, scope: str, principal: str, path: str) -> Optional[str]:
+        # Версия элемента читается отдельно: ее смена делает недоступными все ответы по элементу
+        found = SafeCache.get_many([ResponseCacheService._get_version_key(element_name)])
+        if found is None:
+            # Redis недоступен: ответ строится без кэша
+            return None
+        version = found.get(ResponseCacheService._get_version_key(element_name))
+        return f"response_cache:{element_name}:{version}:{scope}:{principal}:{path}"
+
+    @staticmethod
+    def get(cache_key: str) -> Optional[Tuple[int, Any]]:
+        return SafeCache.get(cache_key)
+
+    @staticmethod
+    def set(cache_key: str, status_code: int, data: Any, timeout: Optional[int] = None) -> None:
+        SafeCache.set(
+            cache_key,
+            (status_code, data),
+            timeout=settings.RESPONSE_CACHE_TTL if timeout is None else timeout
+        )
+
+    @staticmethod
+    def invalidate(element_name: str) -> None:
+        SafeCache.invalidate_set(ResponseCacheService._get_version_key(element_name), uuid.uuid4().hex, timeout=None)
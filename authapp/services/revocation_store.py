@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from typing import Optional, Any, Dict, List, Tuple
+
+from authapp.exceptions import RevocationStoreUnavailable
+from authapp.services.circuit_breaker import CircuitBreaker
+from authapp.services.local_cache import LocalTTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    # Черный список и отметки отзыва токенов в Redis, защищенные circuit breaker
+    FAIL_OPEN = 'open'
+    FAIL_CLOSED = 'closed'
+
+    breaker = CircuitBreaker(
+        'revocation',
+        failure_threshold=settings.REVOCATION_BREAKER_FAILURE_THRESHOLD,
+        reset_timeout=settings.REVOCATION_BREAKER_RESET_TIMEOUT
+    )
+
+    # Пока Redis недоступен, записи хранятся локально и ждут повторной отправки
+    _local = LocalTTLCache(
+        max_size=settings.REVOCATION_FALLBACK_MAX_SIZE,
+        ttl=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    )
+    _pending: 'OrderedDict[str, Tuple[Any, float]]' = OrderedDict()
+    _pending_lock = threading.Lock()
+
+    @staticmethod
+    def fail_closed() -> bool:
+        return settings.REVOCATION_FAIL_MODE == RevocationStore.FAIL_CLOSED
+
+    @staticmethod
+    def get_local(key: str) -> Optional[Any]:
+        return RevocationStore._local.get(key)
+
+    @staticmethod
+    def _remember(data: Dict[str, Any], timeout: int) -> None:
+        expires_at = time.time() + timeout
+        with RevocationStore._pending_lock:
+            for key, value in data.items():
+                RevocationStore._local.set(key, value, ttl=timeout)
+                RevocationStore._pending[key] = (value, expires_at)
+                RevocationStore._pending.move_to_end(key)
+
+            dropped = 0
+            while len(RevocationStore._pending) > settings.REVOCATION_FALLBACK_MAX_SIZE:
+                RevocationStore._pending.popitem(last=False)
+                dropped += 1
+
+        if dropped:
+            logger.error("Резервное хранилище отзыва переполнено, потеряно записей: %s", dropped)
+
+    @staticmethod
+    def _merge(local: Any, stored: Any) -> Any:
+        # Отметки отзыва только растут: побеждает более позднее время, откуда бы оно ни пришло.
+        # Для черного списка важно само наличие ключа, поэтому берется значение из Redis
+        if isinstance(local, (int, float)) and isinstance(stored, (int, float)):
+            return max(local, stored)
+        return stored
+
+    @staticmethod
+    def _replay_batch(pending: List[Tuple[str, Tuple[Any, float]]]) -> None:
+        now = time.time()
+        stored = cache.get_many([key for key, _ in pending])
+        for key, (value, expires_at) in pending:
+            timeout = int(expires_at - now)
+            if timeout > 0:
+                # Пока Redis был недоступен, другой процесс мог записать более позднюю отметку
+                merged = value if key not in stored else RevocationStore._merge(value, stored[key])
+                if key not in stored or merged != stored[key]:
+                    cache.set(key, merged, timeout=timeout)
+            # Значение уже в Redis, локальная копия больше не нужна и не должна его перекрывать
+            RevocationStore._local.delete(key)
+
+    @staticmethod
+    def _replay() -> None:
+        with RevocationStore._pending_lock:
+            if not RevocationStore._pending:
+                return
+            pending = list(RevocationStore._pending.items())
+            RevocationStore._pending.clear()
+
+        try:
+            RevocationStore.breaker.call(RevocationStore._replay_batch, pending)
+        except Exception:
+            # Неотправленные записи возвращаются в очередь до следующего восстановления
+            with RevocationStore._pending_lock:
+                for key, item in pending:
+                    RevocationStore._pending.setdefault(key, item)
+            return
+
+        logger.info("В Redis повторно отправлено записей об отзыве: %s", len(pending))
+
+    @staticmethod
+    def set_many(data: Dict[str, Any], timeout: int) -> None:
+        try:
+            RevocationStore.breaker.call(cache.set_many, data, timeout=timeout)
+        except Exception:
+            logger.warning("Redis недоступен, отзыв токенов сохранен локально")
+            RevocationStore._remember(data, timeout)
+            return
+        RevocationStore._replay()
+
+    @staticmethod
+    def set(key: str, value: Any, timeout: int) -> None:
+        RevocationStore.set_many({key: value}, timeout)
+
+    @staticmethod
+    def get_many(keys: List[str]) -> Dict[str, Any]:
+        local = {}
+        for key in keys:
+            value = RevocationStore._local.get(key)
+            if value is not None:
+                local[key] = value
+
+        try:
+            found = RevocationStore.breaker.call(cache.get_many, keys)
+        except Exception:
+            raise RevocationStoreUnavailable(local)
+
+        RevocationStore._replay()
+        merged = dict(found)
+        for key, value in local.items():
+            merged[key] = value if key not in found else RevocationStore._merge(value, found[key])
+        return merged
@@ -0,0 +1,46 @@
+from django.db import transaction
+
+from authapp.models import Role, RoleClosure
+
+
+class RoleHierarchyService:
+    @staticmethod
+    def add_role(role: Role) -> None:
+        links = [RoleClosure(ancestor_id=role.pk, descendant_id=role.pk, depth=0)]
+        if role.parent_id:
+            links += [
+                RoleClosure(ancestor_id=ancestor_id, descendant_id=role.pk, depth=depth + 1)
+                for ancestor_id, depth in RoleClosure.objects.filter(
+                    descendant_id=role.parent_id
+                ).values_list('ancestor_id', 'depth')
+            ]
+        RoleClosure.objects.bulk_create(links)
+
+    @staticmethod
+    def move_role(role: Role) -> None:
+        # Перестраиваются только связи поддерева роли с ее прежними и новыми предками
+        subtree = list(
+            RoleClosure.objects.filter(ancestor_id=role.pk).values_list('descendant_id', 'depth')
+        )
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+
+        with transaction.atomic():
+            RoleClosure.objects.filter(
+                descendant_id__in=subtree_ids
+            ).exclude(
+                ancestor_id__in=subtree_ids
+            ).delete()
+
+            if role.parent_id:
+                ancestors = RoleClosure.objects.filter(
+                    descendant_id=role.parent_id
+                ).values_list('ancestor_id', 'depth')
+                RoleClosure.objects.bulk_create([
+                    RoleClosure(
+                        ancestor_id=ancestor_id,
+                        descendant_id=descendant_id,
+                        depth=ancestor_depth + descendant_depth + 1
+                    )
+                    for ancestor_id, ancestor_depth in ancestors
+                    for descendant_id, descendant_depth in subtree
+                ])
@@ -0,0 +1,120 @@
+import logging
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from typing import Optional, Any, Dict, List, Tuple
+
+from authapp.services.revocation_store import RevocationStore
+
+
+logger = logging.getLogger(__name__)
+
+
+class SafeCache:
+    # Обращения к Redis через circuit breaker хранилища отзыва: при сбое чтение считается промахом,
+    # запись кэша пропускается, а инвалидации откладываются до восстановления
+    _pending: 'OrderedDict[str, Tuple[bool, Any, Optional[int]]]' = OrderedDict()
+    _pending_lock = threading.Lock()
+
+    @staticmethod
+    def get_many(keys: List[str]) -> Optional[Dict[str, Any]]:
+        # None означает, что Redis недоступен и значения нужно брать из БД
+        try:
+            found = RevocationStore.breaker.call(cache.get_many, keys)
+        except Exception:
+            logger.debug("Redis недоступен, чтение из кэша пропущено", exc_info=True)
+            return None
+        SafeCache._replay()
+        return found
+
+    @staticmethod
+    def get(key: str) -> Optional[Any]:
+        found = SafeCache.get_many([key])
+        return found.get(key) if found else None
+
+    @staticmethod
+    def set(key: str, value: Any, timeout: Optional[int]) -> bool:
+        try:
+            RevocationStore.breaker.call(cache.set, key, value, timeout=timeout)
+        except Exception:
+            logger.debug("Redis недоступен, запись в кэш пропущена", exc_info=True)
+            return False
+        return True
+
+    @staticmethod
+    def add(key: str, value: Any, timeout: Optional[int]) -> Optional[bool]:
+        # None - Redis недоступен, False - ключ уже есть
+        try:
+            return RevocationStore.breaker.call(cache.add, key, value, timeout=timeout)
+        except Exception:
+            logger.debug("Redis недоступен, запись в кэш пропущена", exc_info=True)
+            return None
+
+    @staticmethod
+    def _defer(operations: Dict[str, Tuple[bool, Any, Optional[int]]]) -> None:
+        with SafeCache._pending_lock:
+            for key, operation in operations.items():
+                SafeCache._pending[key] = operation
+                SafeCache._pending.move_to_end(key)
+
+            dropped = 0
+            while len(SafeCache._pending) > settings.REVOCATION_FALLBACK_MAX_SIZE:
+                SafeCache._pending.popitem(last=False)
+                dropped += 1
+
+        logger.warning("Redis недоступен, инвалидация кэша отложена: %s", ', '.join(operations))
+        if dropped:
+            logger.error("Очередь отложенных инвалидаций переполнена, потеряно: %s", dropped)
+
+    @staticmethod
+    def _apply(key: str, operation: Tuple[bool, Any, Optional[int]]) -> None:
+        is_delete, value, timeout = operation
+        if is_delete:
+            cache.delete(key)
+        else:
+            cache.set(key, value, timeout=timeout)
+
+    @staticmethod
+    def _replay() -> None:
+        with SafeCache._pending_lock:
+            if not SafeCache._pending:
+                return
+            pending = list(SafeCache._pending.items())
+            SafeCache._pending.clear()
+
+        for index, (key, operation) in enumerate(pending):
+            try:
+                RevocationStore.breaker.call(SafeCache._apply, key, operation)
+            except Exception:
+                with SafeCache._pending_lock:
+                    for rest_key, rest_operation in pending[index:]:
+                        SafeCache._pending.setdefault(rest_key, rest_operation)
+                return
+
+        logger.info("В Redis повторно отправлено инвалидаций: %s", len(pending))
+
+    @staticmethod
+    def invalidate_set(key: str, value: Any, timeout: Optional[int]) -> None:
+        # Смена версии/поколения: при сбое запоминается и повторяется после восстановления
+        if not SafeCache.set(key, value, timeout):
+            SafeCache._defer({key: (False, value, timeout)})
+
+    @staticmethod
+    def invalidate_set_many(values: Dict[str, Any], timeout: Optional[int]) -> None:
+        if not values:
+            return
+        try:
+            RevocationStore.breaker.call(cache.set_many, values, timeout=timeout)
+        except Exception:
+            SafeCache._defer({key: (False, value, timeout) for key, value in values.items()})
+
+    @staticmethod
+    def invalidate_delete(keys: List[str]) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        try:
+            RevocationStore.breaker.call(cache.delete_many, keys)
+        except Exception:
+            SafeCache._defer({key: (True, None, None) for key in keys})
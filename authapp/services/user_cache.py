@@ -0,0 +1,113 @@
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from typing import Optional, Any, List
+
+from authapp.models import User
+from authapp.services.jwt_service import JWTService
+from authapp.services.local_cache import LocalTTLCache
+from authapp.services.revocation_store import RevocationStore
+from authapp.services.safe_cache import SafeCache
+
+
+class UserSnapshotCache:
+    # Поля, нужные аутентификации и проверке прав; порядок совпадает с concrete_fields для User.from_db
+    SNAPSHOT_FIELDS = tuple(
+        field.attname for field in User._meta.concrete_fields
+        if field.attname in {
+            'id', 'email', 'first_name', 'last_name', 'is_active',
+            'is_staff', 'is_superuser', 'role_id', 'updated_at'
+        }
+    )
+    GENERATION_KEY = 'user_snapshot:generation'
+    # Снимок пишется только из основной БД: реплика с отставанием закэшировала бы старые данные на весь TTL
+    SOURCE_DB = 'default'
+
+    _local = LocalTTLCache(
+        max_size=settings.USER_CACHE_LOCAL_MAX_SIZE,
+        ttl=settings.USER_CACHE_LOCAL_TTL
+    )
+
+    @staticmethod
+    def _get_cache_key(user_id: Any) -> str:
+        return f"user_snapshot:{user_id}"
+
+    @staticmethod
+    def _get_version_key(user_id: Any) -> str:
+        return f"user_snapshot:version:{user_id}"
+
+    @staticmethod
+    def get_user(user_id: Any) -> Optional[User]:
+        local_entry = UserSnapshotCache._local.get(user_id)
+
+        if local_entry is None:
+            cache_key = UserSnapshotCache._get_cache_key(user_id)
+            version_key = UserSnapshotCache._get_version_key(user_id)
+            revocation_key = JWTService._get_user_revocation_key(user_id)
+            try:
+                cached = RevocationStore.breaker.call(
+                    cache.get_many,
+                    [cache_key, version_key, UserSnapshotCache.GENERATION_KEY, revocation_key]
+                )
+            except Exception:
+                return UserSnapshotCache._load_without_cache(user_id)
+            # Версия и поколение прочитаны до запроса в БД: если инвалидация придет во время чтения,
+            # запись получит старую метку и следующим чтением будет отброшена
+            stamp = (cached.get(UserSnapshotCache.GENERATION_KEY), cached.get(version_key))
+            entry = cached.get(cache_key)
+
+            if entry and entry['stamp'] == stamp:
+                snapshot = entry['values']
+            else:
+                snapshot = User.objects.using(UserSnapshotCache.SOURCE_DB).filter(id=user_id).values_list(
+                    *UserSnapshotCache.SNAPSHOT_FIELDS
+                ).first()
+                if snapshot is None:
+                    return None
+
+                SafeCache.set(
+                    cache_key,
+                    {'values': snapshot, 'stamp': stamp},
+                    timeout=settings.USER_CACHE_TTL
+                )
+
+            local_entry = (snapshot, cached.get(revocation_key))
+            UserSnapshotCache._local.set(user_id, local_entry)
+
+        snapshot, revoked_before = local_entry
+        # Остальные поля отложены: save() обновит только загруженные, а не затрет пароль
+        user = User.from_db(UserSnapshotCache.SOURCE_DB, UserSnapshotCache.SNAPSHOT_FIELDS, snapshot)
+        user.tokens_revoked_before = revoked_before
+        return user
+
+    @staticmethod
+    def _load_without_cache(user_id: Any) -> Optional[User]:
+        # Redis недоступен: пользователь читается из БД, отзыв берется из резервного хранилища
+        user = User.objects.filter(id=user_id).only(*UserSnapshotCache.SNAPSHOT_FIELDS).first()
+        if user is None:
+            return None
+
+        revoked_before = RevocationStore.get_local(JWTService._get_user_revocation_key(user_id))
+        if revoked_before is None and RevocationStore.fail_closed():
+            revoked_before = float('inf')
+        user.tokens_revoked_before = revoked_before
+        return user
+
+    @staticmethod
+    def invalidate(user_id: Any) -> None:
+        UserSnapshotCache.invalidate_many([user_id])
+
+    @staticmethod
+    def invalidate_many(user_ids: List[Any]) -> None:
+        # Версия переживает запись снимка вдвое, поэтому запоздавшая запись со старой меткой не оживет
+        for user_id in user_ids:
+            UserSnapshotCache._local.delete(user_id)
+        SafeCache.invalidate_set_many(
+            {UserSnapshotCache._get_version_key(user_id): uuid.uuid4().hex for user_id in user_ids},
+            timeout=settings.USER_CACHE_TTL * 2
+        )
+
+    @staticmethod
+    def invalidate_all() -> None:
+        UserSnapshotCache._local.clear()
+        SafeCache.invalidate_set(UserSnapshotCache.GENERATION_KEY, uuid.uuid4().hex, timeout=None)
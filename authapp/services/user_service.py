@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.utils import timezone
+from typing import Any, Iterable
+
+from authapp.models import User
+from authapp.services.jwt_service import JWTService
+from authapp.services.user_cache import UserSnapshotCache
+
+
+class UserService:
+    @staticmethod
+    def bulk_set_active(user_ids: Iterable[Any], is_active: bool) -> int:
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return 0
+
+        # Токены отзываются до UPDATE, чтобы не было окна, когда пользователь уже выключен, а токены действуют
+        if not is_active:
+            JWTService.revoke_user_tokens(user_ids)
+
+        with transaction.atomic():
+            updated = User.objects.filter(id__in=user_ids).update(
+                is_active=is_active,
+                updated_at=timezone.now()
+            )
+
+        # UPDATE не вызывает сигналы post_save, поэтому кэш сбрасывается явно - после коммита внешней транзакции
+        transaction.on_commit(lambda: UserSnapshotCache.invalidate_many(user_ids))
+        return updated
@@ -0,0 +1,165 @@
+import atexit
+from typing import Any
+from django.core.signals import request_finished
+from django.db import close_old_connections, transaction
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from authapp.models import AccessRule, BusinessElement, Role, ServiceClient, User
+from authapp.services.client_credentials import ClientCredentialsService
+from authapp.services.introspection_service import TokenIntrospectionService
+from authapp.services.jwt_service import JWTService
+from authapp.services.last_seen import LastSeenService
+from authapp.services.permission_service import PermissionService
+from authapp.services.policy_bundle import PolicyBundleService
+from authapp.services.response_cache import ResponseCacheService
+from authapp.services.role_hierarchy import RoleHierarchyService
+from authapp.services.user_cache import UserSnapshotCache
+from authapp.services.user_service import UserService
+
+
+@receiver(pre_save, sender=User)
+def remember_user_email(sender: Any, instance: User, update_fields: Any = None, **kwargs: Any) -> None:
+    if instance.pk and (update_fields is None or 'email' in update_fields):
+        instance._previous_email = User.objects.filter(pk=instance.pk).values_list('email', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens_on_email_change(sender: Any, instance: User, created: bool, **kwargs: Any) -> None:
+    # Токены v2 без email не проверяются по адресу, поэтому при его смене они отзываются явно
+    previous = getattr(instance, '_previous_email', None)
+    if not created and previous is not None and previous != instance.email:
+        JWTService.revoke_user_tokens([instance.pk])
+    instance._previous_email = None
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_introspection(sender: Any, instance: User, **kwargs: Any) -> None:
+    user_id = instance.pk
+    transaction.on_commit(lambda: TokenIntrospectionService.invalidate_user(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshot(sender: Any, instance: User, **kwargs: Any) -> None:
+    user_id = instance.pk
+    transaction.on_commit(lambda: UserSnapshotCache.invalidate(user_id))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_permissions(sender: Any, instance: User, **kwargs: Any) -> None:
+    user_id = instance.pk
+    transaction.on_commit(lambda: PermissionService.invalidate_users([user_id]))
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_user_roles_permissions(sender: Any, instance: Any, action: str, reverse: bool, pk_set: Any, **kwargs: Any) -> None:
+    if reverse and action == 'pre_clear':
+        # После clear() со стороны роли pk_set пуст, поэтому участники запоминаются заранее
+        instance._cleared_member_ids = list(instance.members.values_list('id', flat=True))
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        user_ids = [instance.pk]
+    elif action == 'post_clear':
+        user_ids = getattr(instance, '_cleared_member_ids', [])
+    else:
+        user_ids = list(pk_set)
+    transaction.on_commit(lambda: PermissionService.invalidate_users(user_ids))
+
+
+@receiver(pre_save, sender=Role)
+def check_role_parent(sender: Any, instance: Role, **kwargs: Any) -> None:
+    if instance.would_create_cycle(instance.parent_id):
+        raise ValueError("Роль не может наследоваться от своей дочерней роли")
+
+    instance._previous_parent_id = (
+        Role.objects.filter(pk=instance.pk).values_list('parent_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Role)
+def update_role_closure(sender: Any, instance: Role, created: bool, **kwargs: Any) -> None:
+    if created:
+        RoleHierarchyService.add_role(instance)
+    elif getattr(instance, '_previous_parent_id', None) != instance.parent_id:
+        RoleHierarchyService.move_role(instance)
+
+
+@receiver(pre_delete, sender=Role)
+def detach_role_children(sender: Any, instance: Role, **kwargs: Any) -> None:
+    # SET_NULL у parent выполняется UPDATE без сигналов, поэтому дочерние роли отвязываются явно
+    for child in instance.children.all():
+        child.parent = None
+        child.save()
+
+
+@receiver(post_delete, sender=Role)
+def invalidate_role_user_snapshots(sender: Any, instance: Role, **kwargs: Any) -> None:
+    # Удаление роли обнуляет role_id у пользователей через UPDATE без сигналов.
+    # Сохранение роли снимок не меняет: в нем только role_id, а права кэшируются отдельно
+    transaction.on_commit(UserSnapshotCache.invalidate_all)
+
+
+@receiver(post_save, sender=AccessRule)
+@receiver(post_delete, sender=AccessRule)
+@receiver(post_save, sender=BusinessElement)
+@receiver(post_delete, sender=BusinessElement)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_policy_bundle(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # После коммита: иначе параллельный запрос успеет закэшировать данные до коммита под новым поколением
+    transaction.on_commit(PermissionService.invalidate)
+    transaction.on_commit(PolicyBundleService.invalidate)
+
+
+@receiver(post_save, sender=BusinessElement)
+@receiver(post_delete, sender=BusinessElement)
+def invalidate_element_responses(sender: Any, instance: BusinessElement, **kwargs: Any) -> None:
+    element_name = instance.name
+    transaction.on_commit(lambda: ResponseCacheService.invalidate(element_name))
+
+
+@receiver(post_save, sender=ServiceClient)
+@receiver(post_delete, sender=ServiceClient)
+def invalidate_service_client(sender: Any, instance: ServiceClient, **kwargs: Any) -> None:
+    ClientCredentialsService.invalidate(instance.client_id)
+
+
+@receiver(pre_save, sender=ServiceClient)
+def remember_service_client_state(sender: Any, instance: ServiceClient, **kwargs: Any) -> None:
+    instance._previous_is_active = (
+        ServiceClient.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=ServiceClient)
+def sync_service_user_active(sender: Any, instance: ServiceClient, created: bool, **kwargs: Any) -> None:
+    # Сервисный пользователь включается и выключается вместе с клиентом; выключение отзывает выданные токены
+    previous = getattr(instance, '_previous_is_active', None)
+    if not created and previous is not None and previous != instance.is_active:
+        UserService.bulk_set_active([instance.user_id], is_active=instance.is_active)
+
+
+@receiver(post_delete, sender=ServiceClient)
+def deactivate_service_user(sender: Any, instance: ServiceClient, **kwargs: Any) -> None:
+    # Пользователь без клиента не нужен, а его токены не должны действовать до истечения срока
+    UserService.bulk_set_active([instance.user_id], is_active=False)
+
+
+@receiver(request_finished)
+def flush_last_seen(sender: Any, **kwargs: Any) -> None:
+    # request_finished приходит после отправки ответа, поэтому запись не добавляет задержку клиенту
+    if LastSeenService.is_flush_due():
+        LastSeenService.flush()
+        close_old_connections()
+
+
+atexit.register(LastSeenService.flush)
@@ -0,0 +1,60 @@
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterator
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from authapp.models import User
+from authapp.services.last_seen import LastSeenService
+from authapp.services.permission_service import PermissionService
+from authapp.services.revocation_store import RevocationStore
+from authapp.services.safe_cache import SafeCache
+from authapp.services.user_cache import UserSnapshotCache
+
+
+PASSWORD = 'passw0rd123'
+CACHE_METHODS = ('get', 'get_many', 'set', 'set_many', 'add', 'delete', 'delete_many')
+
+
+@contextmanager
+def redis_down() -> Iterator[None]:
+    # Все обращения к кэшу падают, как при недоступном Redis
+    with ExitStack() as stack:
+        for method in CACHE_METHODS:
+            stack.enter_context(mock.patch(
+                f'django.core.cache.backends.locmem.LocMemCache.{method}',
+                side_effect=ConnectionError('redis down')
+            ))
+        yield
+
+
+class AuthTestCase(TestCase):
+    def setUp(self) -> None:
+        # Состояние кэшей и breaker живет на уровне процесса и не должно переходить между тестами
+        LastSeenService._buffer.clear()
+        cache.clear()
+        RevocationStore.breaker.reset()
+        RevocationStore._local.clear()
+        RevocationStore._pending.clear()
+        SafeCache._pending.clear()
+        UserSnapshotCache._local.clear()
+        PermissionService._local_users.clear()
+
+    def tearDown(self) -> None:
+        # Иначе буфер запишется при выходе из процесса, когда тестовой БД уже нет
+        LastSeenService._buffer.clear()
+
+    def create_user(self, email: str, **kwargs: Any) -> User:
+        return User.objects.create_user(email=email, password=PASSWORD, first_name='Иван', last_name='Иванов', **kwargs)
+
+    def login(self, email: str, **extra: Any) -> Dict[str, Any]:
+        response = APIClient().post('/authapp/login/', {'email': email, 'password': PASSWORD, **extra}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['tokens']
+
+    def client_for(self, token: str) -> APIClient:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
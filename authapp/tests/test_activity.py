@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+
+from authapp.services.activity_service import ActivityService
+from authapp.tests.base import AuthTestCase
+
+
+class ActivityServiceTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        ActivityService.breaker.reset()
+        self.client_mock = mock.Mock()
+        self.pipeline = self.client_mock.pipeline.return_value
+        patcher = mock.patch.object(ActivityService, '_get_client', return_value=self.client_mock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_record_sends_one_pipeline(self) -> None:
+        ActivityService.record(ActivityService.EVENT_LOGIN, 7)
+
+        self.pipeline.pfadd.assert_called_once_with(mock.ANY, 7)
+        self.assertEqual(self.pipeline.incr.call_count, 2)
+        self.pipeline.execute.assert_called_once_with()
+
+    def test_record_ignores_redis_errors(self) -> None:
+        self.pipeline.execute.side_effect = ConnectionError
+
+        ActivityService.record(ActivityService.EVENT_REQUEST, 7)
+
+    def test_stats_are_aggregated_by_window(self) -> None:
+        counters = []
+        for event in ActivityService.EVENTS:
+            minutes = [b'1'] * 60 if event == ActivityService.EVENT_LOGIN else [None] * 60
+            hours = [b'2'] * 24 if event == ActivityService.EVENT_LOGIN else [None] * 24
+            if event == ActivityService.EVENT_LOGIN_FAILED:
+                minutes = [b'3'] + [None] * 59
+            counters += [minutes, hours]
+        self.pipeline.execute.return_value = [5, 40, *counters]
+
+        stats = ActivityService.get_stats()
+
+        self.assertEqual((stats['dau'], stats['mau']), (5, 40))
+        self.assertEqual(stats['events']['login'], {
+            'last_minute': 1, 'last_5_minutes': 5, 'last_hour': 60, 'last_24_hours': 48,
+        })
+        self.assertEqual(stats['login_failure_rate'], round(3 / 63, 4))
+        self.assertIsNone(stats['refresh_failure_rate'])
+
+    def test_stats_endpoint_returns_503_when_redis_is_down(self) -> None:
+        self.pipeline.execute.side_effect = ConnectionError
+        self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        client = self.client_for(self.login('admin@example.com')['access_token'])
+
+        with self.assertLogs('authapp.services.activity_service', 'WARNING'):
+            response = client.get('/authapp/admin/activity/')
+            with self.assertRaises(CommandError):
+                call_command('activity_stats')
+
+        self.assertEqual(response.status_code, 503)
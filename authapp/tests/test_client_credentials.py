@@ -0,0 +1,64 @@
+from unittest import mock
+
+from authapp.models import User
+from authapp.services import client_credentials
+from authapp.services.client_credentials import ClientCredentialsService
+from authapp.tests.base import AuthTestCase
+
+
+class ClientCredentialsTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.service_client, self.secret = ClientCredentialsService.create_client('billing')
+
+    def _request_token(self, client_secret: str):
+        return self.client.post(
+            '/authapp/token/',
+            {
+                'grant_type': 'client_credentials',
+                'client_id': self.service_client.client_id,
+                'client_secret': client_secret
+            },
+            content_type='application/json'
+        )
+
+    def test_token_endpoint_authenticates_service_user(self) -> None:
+        response = self._request_token(self.secret)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['token_type'], 'bearer')
+
+        profile = self.client_for(response.json()['access_token']).get('/authapp/profile/')
+        self.assertEqual(profile.status_code, 200)
+        self.assertEqual(profile.json()['email'], self.service_client.user.email)
+
+        self.assertEqual(self._request_token('wrong-secret').status_code, 401)
+
+    def test_token_is_reused_without_rechecking_secret(self) -> None:
+        first = ClientCredentialsService.issue_token(self.service_client.client_id, self.secret)
+
+        with mock.patch.object(client_credentials, 'check_password') as check_password:
+            second = ClientCredentialsService.issue_token(self.service_client.client_id, self.secret)
+
+        check_password.assert_not_called()
+        self.assertEqual(second['access_token'], first['access_token'])
+
+    def test_rotated_secret_replaces_old_one(self) -> None:
+        old_token = ClientCredentialsService.issue_token(self.service_client.client_id, self.secret)
+
+        new_secret = ClientCredentialsService.rotate_secret(self.service_client)
+
+        self.assertIsNone(ClientCredentialsService.issue_token(self.service_client.client_id, self.secret))
+        new_token = ClientCredentialsService.issue_token(self.service_client.client_id, new_secret)
+        self.assertIsNotNone(new_token)
+        self.assertNotEqual(new_token['access_token'], old_token['access_token'])
+
+    def test_deactivated_client_disables_service_user(self) -> None:
+        access_token = ClientCredentialsService.issue_token(self.service_client.client_id, self.secret)['access_token']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service_client.is_active = False
+            self.service_client.save()
+
+        self.assertFalse(User.objects.get(pk=self.service_client.user_id).is_active)
+        self.assertIsNone(ClientCredentialsService.issue_token(self.service_client.client_id, self.secret))
+        self.assertEqual(self.client_for(access_token).get('/authapp/profile/').status_code, 403)
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from authapp import db_router
+from authapp.models import User
+from rest_framework.test import APIClient
+
+from authapp.services.last_seen import LastSeenService
+from authapp.services.permission_service import PermissionService
+from authapp.services.user_cache import UserSnapshotCache
+from authapp.tests.base import PASSWORD
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRouterTests(TransactionTestCase):
+    # Данные коммитятся, поэтому зеркало видит то же, что и default
+    databases = {'default', 'replica_1'}
+
+    def setUp(self) -> None:
+        LastSeenService._buffer.clear()
+        self.addCleanup(LastSeenService._buffer.clear)
+        cache.clear()
+        UserSnapshotCache._local.clear()
+        PermissionService._local_users.clear()
+        db_router.reset_request_state()
+        self.addCleanup(db_router.reset_request_state)
+
+    def count_queries(self, action) -> dict:
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_1']) as replica:
+            action()
+        return {'default': len(primary), 'replica_1': len(replica)}
+
+    def test_reads_go_to_replica(self) -> None:
+        self.assertEqual(self.count_queries(lambda: User.objects.count()), {'default': 0, 'replica_1': 1})
+
+    def test_reads_after_write_go_to_primary(self) -> None:
+        User.objects.create_user(email='user@example.com', password=PASSWORD, first_name='Иван', last_name='Иванов')
+
+        self.assertEqual(self.count_queries(lambda: User.objects.count()), {'default': 1, 'replica_1': 0})
+
+    def test_write_pins_next_request_to_primary(self) -> None:
+        user = User.objects.create_user(email='user@example.com', password=PASSWORD, first_name='Иван', last_name='Иванов')
+        client = APIClient()
+        response = client.post('/authapp/login/', {'email': user.email, 'password': PASSWORD}, format='json')
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['tokens']['access_token']}")
+
+        def get_permissions() -> None:
+            PermissionService._local_users.clear()
+            cache.delete(PermissionService._get_user_cache_key(user.pk))
+            self.assertEqual(client.get('/authapp/products/').status_code, 200)
+
+        self.assertEqual(self.count_queries(get_permissions)['replica_1'], 1)
+
+        response = client.patch('/authapp/profile/', {'first_name': 'Петр'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(cache.get(db_router._get_pin_key(user.pk)))
+        self.assertEqual(self.count_queries(get_permissions)['replica_1'], 0)
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from authapp.models import AccessRule, BusinessElement, Role
+from authapp.tests.base import AuthTestCase
+
+
+class ExportTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.admin = self.client_for(self.login('admin@example.com')['access_token'])
+
+    def read(self, response) -> str:
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_csv_export_streams_all_rows(self) -> None:
+        role = Role.objects.create(name='reader')
+        self.create_user('user@example.com', role=role)
+
+        rows = list(csv.DictReader(io.StringIO(self.read(self.admin.get('/authapp/admin/export/users/')))))
+
+        self.assertEqual([row['email'] for row in rows], ['admin@example.com', 'user@example.com'])
+        self.assertEqual(rows[1]['role_name'], 'reader')
+
+    def test_jsonl_export(self) -> None:
+        role = Role.objects.create(name='reader')
+        AccessRule.objects.create(role=role, business_element=BusinessElement.objects.create(name='product'), read_permission=True)
+
+        content = self.read(self.admin.get('/authapp/admin/export/access-rules/', {'output': 'jsonl'}))
+        rows = [json.loads(line) for line in content.splitlines()]
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['role_name'], rows[0]['business_element_name']), ('reader', 'product'))
+        self.assertTrue(rows[0]['read_permission'])
+
+    def test_csv_cells_are_not_formulas(self) -> None:
+        for name in ('=HYPERLINK("http://evil")', '+1', '-1', '@SUM(A1)', 'ok'):
+            Role.objects.create(name=name)
+
+        rows = list(csv.DictReader(io.StringIO(self.read(self.admin.get('/authapp/admin/export/roles/')))))
+
+        self.assertEqual(
+            [row['name'] for row in rows],
+            ['\'=HYPERLINK("http://evil")', "'+1", "'-1", "'@SUM(A1)", 'ok']
+        )
+
+    def test_unknown_dataset_and_non_admin(self) -> None:
+        self.create_user('user@example.com')
+        user = self.client_for(self.login('user@example.com')['access_token'])
+
+        self.assertEqual(self.admin.get('/authapp/admin/export/passwords/').status_code, 404)
+        self.assertEqual(user.get('/authapp/admin/export/users/').status_code, 403)
+
+    def test_command_writes_to_stdout(self) -> None:
+        Role.objects.create(name='reader')
+        stdout = io.StringIO()
+
+        call_command('export_data', 'roles', stdout=stdout)
+
+        self.assertEqual(stdout.getvalue().splitlines()[1].split(',')[1], 'reader')
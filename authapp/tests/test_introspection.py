@@ -0,0 +1,82 @@
+from authapp.models import AccessRule, BusinessElement, Role
+from authapp.services.jwt_service import JWTService
+from authapp.tests.base import AuthTestCase
+
+
+class TokenIntrospectionTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        role = Role.objects.create(name='service')
+        element = BusinessElement.objects.create(name='token_introspection')
+        AccessRule.objects.create(role=role, business_element=element, create_permission=True)
+        self.create_user('service@example.com', role=role)
+        self.service = self.client_for(self.login('service@example.com')['access_token'])
+
+    def introspect(self, token: str) -> dict:
+        response = self.service.post('/authapp/introspect/', {'token': token}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_user_without_rule_is_denied(self) -> None:
+        self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+        client = self.client_for(tokens['access_token'])
+
+        single = client.post('/authapp/introspect/', {'token': tokens['access_token']}, format='json')
+        batch = client.post('/authapp/introspect/batch/', {'tokens': [tokens['access_token']]}, format='json')
+
+        self.assertEqual(single.status_code, 403)
+        self.assertEqual(batch.status_code, 403)
+
+    def test_superuser_is_allowed_without_rule(self) -> None:
+        self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        tokens = self.login('admin@example.com')
+
+        response = self.client_for(tokens['access_token']).post(
+            '/authapp/introspect/', {'token': tokens['access_token']}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_introspect_active_and_invalid_tokens(self) -> None:
+        user = self.create_user('user@example.com')
+        access_token = self.login('user@example.com')['access_token']
+
+        result = self.introspect(access_token)
+        self.assertTrue(result['active'])
+        self.assertEqual(result['sub'], str(user.pk))
+        self.assertEqual(result['token_type'], 'access')
+        self.assertEqual(self.introspect('not-a-token'), {'active': False})
+
+    def test_batch_keeps_token_order(self) -> None:
+        self.create_user('user@example.com')
+        access_token = self.login('user@example.com')['access_token']
+
+        response = self.service.post(
+            '/authapp/introspect/batch/', {'tokens': ['not-a-token', access_token]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results[0], {'active': False})
+        self.assertTrue(results[1]['active'])
+
+    def test_cached_response_is_dropped_on_deactivation(self) -> None:
+        user = self.create_user('user@example.com')
+        access_token = self.login('user@example.com')['access_token']
+        self.assertTrue(self.introspect(access_token)['active'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save()
+
+        self.assertEqual(self.introspect(access_token), {'active': False})
+
+    def test_cached_response_is_dropped_on_blacklist(self) -> None:
+        self.create_user('user@example.com')
+        refresh_token = self.login('user@example.com')['refresh_token']
+        self.assertTrue(self.introspect(refresh_token)['active'])
+
+        JWTService.blacklist_refresh_token(refresh_token)
+
+        self.assertEqual(self.introspect(refresh_token), {'active': False})
@@ -0,0 +1,53 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+from authapp.models import User
+from authapp.services.last_seen import LastSeenService
+from authapp.tests.base import AuthTestCase
+
+
+class LastSeenTests(AuthTestCase):
+    def test_touches_are_coalesced_per_user(self) -> None:
+        first = self.create_user('first@example.com')
+        second = self.create_user('second@example.com')
+        moment = timezone.now()
+
+        LastSeenService.touch(first.pk, moment=moment - timedelta(minutes=1))
+        LastSeenService.touch(first.pk, moment=moment)
+        LastSeenService.touch(second.pk, LastSeenService.FIELD_LAST_SEEN, LastSeenService.FIELD_LAST_LOGIN, moment=moment)
+
+        self.assertEqual(LastSeenService.flush(), 2)
+        self.assertEqual(LastSeenService._buffer, {})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.last_seen, moment)
+        self.assertIsNone(first.last_login)
+        self.assertEqual((second.last_seen, second.last_login), (moment, moment))
+
+    def test_earlier_time_does_not_overwrite_later(self) -> None:
+        user = self.create_user('user@example.com')
+        later = timezone.now()
+        User.objects.filter(pk=user.pk).update(last_seen=later)
+
+        LastSeenService.touch(user.pk, moment=later - timedelta(hours=1))
+        LastSeenService.flush()
+
+        user.refresh_from_db()
+        self.assertEqual(user.last_seen, later)
+
+    def test_failed_write_is_retried(self) -> None:
+        user = self.create_user('user@example.com')
+        earlier = timezone.now() - timedelta(minutes=5)
+        LastSeenService.touch(user.pk, moment=earlier)
+
+        with mock.patch.object(LastSeenService, '_write_batch', side_effect=DatabaseError), \
+                self.assertLogs('authapp.services.last_seen', 'WARNING'):
+            self.assertEqual(LastSeenService.flush(), 0)
+
+        self.assertEqual(LastSeenService._buffer[user.pk][LastSeenService.FIELD_LAST_SEEN], earlier)
+        self.assertEqual(LastSeenService.flush(), 1)
+        user.refresh_from_db()
+        self.assertEqual(user.last_seen, earlier)
@@ -0,0 +1,33 @@
+from django.test import override_settings
+
+from authapp.management.commands.loadtest import Command, _parse_server_timing
+from authapp.tests.base import AuthTestCase
+
+
+class ServerTimingTests(AuthTestCase):
+    @override_settings(SERVER_TIMING_ENABLED=True)
+    def test_header_reports_db_and_total_time(self) -> None:
+        self.create_user('user@example.com')
+        response = self.client_for(self.login('user@example.com')['access_token']).get('/authapp/profile/')
+
+        timing = _parse_server_timing(response['Server-Timing'])
+        self.assertEqual(set(timing), {'db', 'total'})
+        self.assertLessEqual(timing['db'], timing['total'])
+
+    def test_header_is_off_by_default(self) -> None:
+        self.create_user('user@example.com')
+        response = self.client_for(self.login('user@example.com')['access_token']).get('/authapp/profile/')
+
+        self.assertNotIn('Server-Timing', response)
+
+    def test_client_time_is_split_into_shares(self) -> None:
+        shares = Command._split_time([
+            {'db': 0.1, 'total': 0.5, 'client': 1.0},
+            None,
+            {'db': 0.1, 'total': 0.3, 'client': 1.0},
+        ])
+
+        self.assertAlmostEqual(shares['db_share'], 0.1)
+        self.assertAlmostEqual(shares['app_share'], 0.3)
+        self.assertAlmostEqual(shares['wait_share'], 0.6)
+        self.assertIsNone(Command._split_time([None])['db_share'])
@@ -0,0 +1,54 @@
+from typing import Tuple
+from unittest import mock
+
+from django.test import RequestFactory
+
+from authapp.mixins import OwnerScopedQuerysetMixin
+from authapp.models import AccessRule, BusinessElement, Role, User
+from authapp.tests.base import AuthTestCase
+
+
+class StubListView:
+    business_element = 'invoice'
+
+    def __init__(self, queryset: mock.Mock) -> None:
+        self.queryset = queryset
+
+    def get_queryset(self) -> mock.Mock:
+        return self.queryset
+
+
+class ScopedListView(OwnerScopedQuerysetMixin, StubListView):
+    pass
+
+
+class OwnerScopedQuerysetTests(AuthTestCase):
+    def get_scoped_queryset(self, **rule_flags: bool) -> Tuple[mock.Mock, mock.Mock, User]:
+        role = Role.objects.create(name='accountant')
+        element = BusinessElement.objects.create(name='invoice')
+        AccessRule.objects.create(role=role, business_element=element, **rule_flags)
+        user = self.create_user('user@example.com', role=role)
+
+        request = RequestFactory().get('/invoices/')
+        request.user = user
+        view = ScopedListView(mock.Mock())
+        view.request = request
+        return view.get_queryset(), view.queryset, user
+
+    def test_read_permission_filters_by_owner(self) -> None:
+        result, queryset, user = self.get_scoped_queryset(read_permission=True)
+
+        queryset.filter.assert_called_once_with(owner=user.pk)
+        self.assertIs(result, queryset.filter.return_value)
+
+    def test_read_all_permission_returns_queryset_unfiltered(self) -> None:
+        result, queryset, _ = self.get_scoped_queryset(read_permission=True, read_all_permission=True)
+
+        self.assertIs(result, queryset)
+        queryset.filter.assert_not_called()
+
+    def test_no_permission_returns_empty_queryset(self) -> None:
+        result, queryset, _ = self.get_scoped_queryset()
+
+        self.assertIs(result, queryset.none.return_value)
+        queryset.filter.assert_not_called()
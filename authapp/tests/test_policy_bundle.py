@@ -0,0 +1,79 @@
+import json
+
+from authapp.models import AccessRule, BusinessElement, Role
+from authapp.permissions import HasPermission
+from authapp.policy_evaluator import METHOD_TO_PERMISSION, PolicyEvaluator, decode_binary
+from authapp.services.permission_service import PermissionService
+from authapp.tests.base import AuthTestCase
+
+
+class PolicyBundleTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.base = Role.objects.create(name='base')
+        self.child = Role.objects.create(name='child', parent=self.base)
+        self.other = Role.objects.create(name='other')
+        product = BusinessElement.objects.create(name='product')
+        order = BusinessElement.objects.create(name='order')
+        BusinessElement.objects.create(name='token_introspection')
+        AccessRule.objects.create(role=self.base, business_element=product, read_permission=True)
+        AccessRule.objects.create(role=self.child, business_element=product, update_permission=True)
+        AccessRule.objects.create(role=self.child, business_element=order, read_all_permission=True)
+        AccessRule.objects.create(role=self.other, business_element=order, delete_permission=True)
+
+        self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.admin = self.client_for(self.login('admin@example.com')['access_token'])
+
+    def test_etag_and_conditional_requests(self) -> None:
+        response = self.admin.get('/authapp/admin/policy-bundle/')
+        self.assertEqual(response.status_code, 200)
+        bundle = json.loads(response.content)
+        self.assertEqual(response['ETag'], f'"{bundle["version"]}"')
+
+        cached = self.admin.get('/authapp/admin/policy-bundle/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+        binary = self.admin.get('/authapp/admin/policy-bundle/', {'encoding': 'binary'})
+        self.assertEqual(binary['ETag'], f'"{bundle["version"]}-bin"')
+        decoded = decode_binary(binary.content)
+        self.assertEqual((decoded['elements'], decoded['rules']), (bundle['elements'], bundle['rules']))
+
+    def test_rule_change_changes_version(self) -> None:
+        etag = self.admin.get('/authapp/admin/policy-bundle/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AccessRule.objects.filter(role=self.other).update(delete_permission=False)
+            AccessRule.objects.get(role=self.other).save()
+
+        response = self.admin.get('/authapp/admin/policy-bundle/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_evaluator_matches_has_permission(self) -> None:
+        users = [
+            self.create_user('base@example.com', role=self.base),
+            self.create_user('child@example.com', role=self.child),
+            self.create_user('other@example.com', role=self.other),
+            self.create_user('nobody@example.com'),
+            self.create_user('root@example.com', is_superuser=True),
+        ]
+        users.append(self.create_user('both@example.com', role=self.child))
+        users[-1].roles.add(self.other)
+
+        evaluator = PolicyEvaluator.from_binary(self.admin.get('/authapp/admin/policy-bundle/', {'encoding': 'binary'}).content)
+        permission = HasPermission()
+        for user in users:
+            PermissionService._local_users.clear()
+            for element_name in ('product', 'order', 'token_introspection', 'unknown'):
+                for method in METHOD_TO_PERMISSION:
+                    for require_rule in (False, True):
+                        expected = permission.has_element_permission(user, element_name, method, require_rule)
+                        actual = evaluator.check(
+                            role_id=user.role_id,
+                            role_ids=user.get_role_ids(),
+                            element_name=element_name,
+                            request_method=method,
+                            is_superuser=user.is_superuser,
+                            require_rule=require_rule
+                        )
+                        self.assertEqual(actual, expected, (user.email, element_name, method, require_rule))
@@ -0,0 +1,64 @@
+from rest_framework.test import APIClient
+
+from authapp.models import AccessRule, BusinessElement, Role
+from authapp.services.policy_simulation import PolicySimulationService
+from authapp.tests.base import AuthTestCase
+
+
+class PolicySimulationTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.reader = Role.objects.create(name='reader')
+        self.manager = Role.objects.create(name='manager')
+        self.element = BusinessElement.objects.create(name='product')
+        AccessRule.objects.create(role=self.reader, business_element=self.element, read_permission=True)
+        AccessRule.objects.create(role=self.manager, business_element=self.element, read_all_permission=True)
+
+        self.create_user('reader@example.com', role=self.reader)
+        self.create_user('reader2@example.com', role=self.reader)
+        both = self.create_user('both@example.com', role=self.reader)
+        both.roles.add(self.manager)
+        self.create_user('inactive@example.com', role=self.reader, is_active=False)
+        self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+
+    def test_counts_users_by_role_set(self) -> None:
+        counts = PolicySimulationService.count_users_by_role_set()
+
+        self.assertEqual(dict(counts), {
+            (self.reader.pk,): 2,
+            tuple(sorted((self.reader.pk, self.manager.pk))): 1,
+        })
+
+    def test_simulate_reports_role_and_user_changes(self) -> None:
+        result = PolicySimulationService.simulate([
+            {'role': self.reader, 'business_element': self.element, 'read_permission': False},
+        ])
+
+        self.assertEqual(result['affected_business_elements'], ['product'])
+        self.assertEqual(result['affected_users'], 2)
+        self.assertEqual(result['role_decision_changes'], [{
+            'role_id': self.reader.pk,
+            'role': 'reader',
+            'business_element': 'product',
+            'method': 'GET',
+            'old': 'own',
+            'new': 'deny',
+        }])
+        self.assertEqual(result['user_decision_changes'], [
+            {'business_element': 'product', 'method': 'GET', 'old': 'own', 'new': 'deny', 'users': 2},
+        ])
+        self.assertTrue(AccessRule.objects.get(role=self.reader).read_permission)
+
+    def test_endpoint_is_admin_only(self) -> None:
+        body = {'changes': [{'role': self.reader.pk, 'business_element': 'product', 'delete': True}]}
+        self.create_user('user@example.com')
+
+        user = self.client_for(self.login('user@example.com')['access_token'])
+        admin = self.client_for(self.login('admin@example.com')['access_token'])
+
+        self.assertEqual(user.post('/authapp/admin/policy-simulation/', body, format='json').status_code, 403)
+        response = admin.post('/authapp/admin/policy-simulation/', body, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Без правила роль reader больше ничего не ограничивает, в том числе у пользователя с двумя ролями
+        self.assertEqual(response.json()['affected_users'], 3)
+        self.assertEqual(APIClient().post('/authapp/admin/policy-simulation/', body, format='json').status_code, 403)
@@ -0,0 +1,51 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from authapp.tests.base import AuthTestCase
+
+
+class SampledProfilingTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output_dir = Path(directory.name)
+        self.create_user('user@example.com')
+        self.access_token = self.login('user@example.com')['access_token']
+
+    def get_profile(self, **headers: str) -> None:
+        with override_settings(PROFILING_ENABLED=True, PROFILING_DIR=str(self.output_dir)):
+            # Middleware собирается при первом запросе клиента, поэтому клиент создается внутри override_settings
+            client = self.client_for(self.access_token)
+            self.assertEqual(client.get('/authapp/profile/', **headers).status_code, 200)
+
+    def test_signed_header_profiles_request(self) -> None:
+        stdout = io.StringIO()
+        call_command('profiling_token', stdout=stdout)
+        header, token = stdout.getvalue().strip().split(': ')
+
+        self.get_profile(**{f"HTTP_{header.upper().replace('-', '_')}": token})
+
+        metadata = [json.loads(path.read_text()) for path in self.output_dir.glob('*.json')]
+        self.assertEqual(len(list(self.output_dir.glob('*.prof'))), 1)
+        self.assertEqual(
+            [(item['path'], item['status_code'], item['reason']) for item in metadata],
+            [('/authapp/profile/', 200, 'header')]
+        )
+
+    def test_unsigned_header_is_not_profiled(self) -> None:
+        self.get_profile(HTTP_X_PROFILE_TOKEN='profile:forged:signature')
+
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1.0)
+    def test_sampled_request_is_profiled(self) -> None:
+        self.get_profile()
+
+        reasons = {json.loads(path.read_text())['reason'] for path in self.output_dir.glob('*.json')}
+        self.assertEqual(reasons, {'sample'})
@@ -0,0 +1,46 @@
+from rest_framework.test import APIClient
+
+from authapp.services.jwt_service import JWTService
+from authapp.tests.base import AuthTestCase, redis_down
+
+
+class ReferenceTokenTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = self.create_user('user@example.com')
+
+    def test_login_issues_working_reference_token(self) -> None:
+        tokens = self.login('user@example.com', token_mode='reference')
+
+        self.assertTrue(JWTService.is_reference_token(tokens['access_token']))
+        self.assertFalse(JWTService.is_reference_token(tokens['refresh_token']))
+        self.assertEqual(self.client_for(tokens['access_token']).get('/authapp/profile/').status_code, 200)
+
+    def test_logout_deletes_reference_token(self) -> None:
+        tokens = self.login('user@example.com', token_mode='reference')
+        client = self.client_for(tokens['access_token'])
+
+        response = client.post('/authapp/logout/', {'refresh_token': tokens['refresh_token']}, format='json')
+
+        self.assertEqual(response.status_code, 205)
+        self.assertIsNone(JWTService.verify_token(tokens['access_token']))
+        self.assertEqual(client.get('/authapp/profile/').status_code, 403)
+
+    def test_refresh_issues_reference_token_on_request(self) -> None:
+        tokens = self.login('user@example.com')
+
+        response = APIClient().post(
+            '/authapp/refresh/', {'refresh_token': tokens['refresh_token'], 'token_mode': 'reference'}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        access_token = response.json()['access_token']
+        self.assertTrue(JWTService.is_reference_token(access_token))
+        self.assertEqual(JWTService.verify_token(access_token)['id'], self.user.pk)
+
+    def test_falls_back_to_jwt_while_redis_is_down(self) -> None:
+        with redis_down():
+            access_token = JWTService.generate_access_token({'id': self.user.pk, 'email': self.user.email}, 'reference')
+
+        self.assertFalse(JWTService.is_reference_token(access_token))
+        self.assertEqual(JWTService.verify_token(access_token)['id'], self.user.pk)
@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.db.models import QuerySet
+from rest_framework.test import APIClient
+
+from authapp.models import User
+from authapp.serializers import UserRegisterSerializer
+from authapp.tests.base import PASSWORD, AuthTestCase
+
+
+class RegistrationTests(AuthTestCase):
+    def register(self, email: str, password2: str = PASSWORD) -> dict:
+        return APIClient().post('/authapp/register/', {
+            'email': email,
+            'first_name': 'Иван',
+            'last_name': 'Иванов',
+            'password': PASSWORD,
+            'password2': password2,
+        }, format='json')
+
+    def test_registers_user_with_normalized_email(self) -> None:
+        response = self.register('new@EXAMPLE.com')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(User.objects.get(email='new@example.com').check_password(PASSWORD))
+
+    def test_duplicate_is_rejected_before_hashing(self) -> None:
+        self.create_user('user@example.com')
+
+        with mock.patch('authapp.serializers.validate_password') as validate_password, \
+                mock.patch('django.contrib.auth.base_user.make_password') as make_password:
+            response = self.register('user@EXAMPLE.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['email'], [UserRegisterSerializer.DUPLICATE_EMAIL_ERROR])
+        validate_password.assert_not_called()
+        make_password.assert_not_called()
+
+    @mock.patch('authapp.serializers.validate_password')
+    def test_password_mismatch_skips_password_validators(self, validate_password: mock.Mock) -> None:
+        response = self.register('new@example.com', password2='other-passw0rd')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password2', response.json())
+        validate_password.assert_not_called()
+
+    def test_concurrent_duplicate_returns_400(self) -> None:
+        self.create_user('user@example.com')
+
+        # Параллельная регистрация: проверка exists() прошла до вставки первой строки
+        with mock.patch.object(QuerySet, 'exists', return_value=False):
+            response = self.register('user@example.com')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['email'], [UserRegisterSerializer.DUPLICATE_EMAIL_ERROR])
+        self.assertEqual(User.objects.filter(email='user@example.com').count(), 1)
@@ -0,0 +1,76 @@
+from typing import Any
+
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from authapp.mixins import PermissionScopedCacheMixin
+from authapp.models import AccessRule, BusinessElement, Role
+from authapp.permissions import HasPermission
+from authapp.tests.base import AuthTestCase
+
+
+class CatalogView(PermissionScopedCacheMixin, APIView):
+    permission_classes = [HasPermission]
+    business_element = 'product'
+
+    def get(self, request) -> Response:
+        return Response([{'id': 1, 'name': 'Продукт 1'}], status=200)
+
+
+class OwnedCatalogView(CatalogView):
+    response_cache_per_user = True
+
+    def get(self, request) -> Response:
+        return Response({'id': 1, 'owner': request.user.id}, status=200)
+
+
+class ResponseCacheTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        role = Role.objects.create(name='reader')
+        self.element = BusinessElement.objects.create(name='product')
+        AccessRule.objects.create(role=role, business_element=self.element, read_permission=True, read_all_permission=True)
+        self.first = self.create_user('first@example.com', role=role)
+        self.second = self.create_user('second@example.com', role=role)
+
+    def get(self, email: str, view: Any = CatalogView) -> Any:
+        access_token = self.login(email)['access_token']
+        request = APIRequestFactory().get('/catalog/', HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        return view.as_view()(request)
+
+    def test_users_with_same_rights_share_entry(self) -> None:
+        self.assertEqual(self.get('first@example.com')['X-Cache'], 'MISS')
+        self.assertEqual(self.get('second@example.com')['X-Cache'], 'HIT')
+
+    def test_caller_dependent_response_is_not_shared(self) -> None:
+        first = self.get('first@example.com', OwnedCatalogView)
+        second = self.get('second@example.com', OwnedCatalogView)
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'MISS')
+        self.assertEqual(second.data['owner'], self.second.pk)
+
+        repeated = self.get('first@example.com', OwnedCatalogView)
+        self.assertEqual(repeated['X-Cache'], 'HIT')
+        self.assertEqual(repeated.data['owner'], self.first.pk)
+
+    def test_element_change_invalidates_responses(self) -> None:
+        self.get('first@example.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.element.save()
+
+        self.assertEqual(self.get('first@example.com')['X-Cache'], 'MISS')
+
+    def test_forbidden_user_does_not_get_cached_body(self) -> None:
+        self.get('first@example.com')
+        outsider = self.create_user('outsider@example.com', role=Role.objects.create(name='none'))
+        AccessRule.objects.create(role=outsider.role, business_element=self.element)
+
+        self.assertEqual(self.get('outsider@example.com').status_code, 403)
+
+    def test_product_mock_is_not_cached(self) -> None:
+        response = self.client_for(self.login('first@example.com')['access_token']).get('/authapp/products/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Cache', response)
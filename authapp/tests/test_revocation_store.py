@@ -0,0 +1,115 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from authapp.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from authapp.services.jwt_service import JWTService
+from authapp.services.revocation_store import RevocationStore
+from authapp.services.safe_cache import SafeCache
+from authapp.services.user_cache import UserSnapshotCache
+from authapp.tests.base import AuthTestCase, redis_down
+
+
+class CircuitBreakerTests(TestCase):
+    def test_opens_after_threshold_and_rejects_calls(self) -> None:
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=60)
+        failing = mock.Mock(side_effect=ConnectionError)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                breaker.call(failing)
+
+        self.assertEqual(breaker.state, CircuitBreaker.STATE_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(failing)
+        self.assertEqual(failing.call_count, 2)
+
+    def test_half_open_probe_closes_breaker(self) -> None:
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0)
+        with self.assertRaises(ConnectionError):
+            breaker.call(mock.Mock(side_effect=ConnectionError))
+
+        self.assertEqual(breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(breaker.state, CircuitBreaker.STATE_CLOSED)
+
+
+class RedisFallbackTests(AuthTestCase):
+    def test_requests_work_while_redis_is_down(self) -> None:
+        self.create_user('user@example.com')
+
+        with redis_down():
+            client = self.client_for(self.login('user@example.com')['access_token'])
+            statuses = [client.get('/authapp/profile/').status_code for _ in range(settings.REVOCATION_BREAKER_FAILURE_THRESHOLD)]
+
+        self.assertEqual(statuses, [200] * settings.REVOCATION_BREAKER_FAILURE_THRESHOLD)
+        self.assertEqual(RevocationStore.breaker.state, CircuitBreaker.STATE_OPEN)
+
+    @override_settings(REVOCATION_FAIL_MODE='closed')
+    def test_fail_closed_rejects_tokens_while_redis_is_down(self) -> None:
+        self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+        UserSnapshotCache._local.clear()
+
+        with redis_down():
+            response = self.client_for(tokens['access_token']).get('/authapp/profile/')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalidations_are_replayed_after_recovery(self) -> None:
+        user = self.create_user('user@example.com')
+        version_key = UserSnapshotCache._get_version_key(user.pk)
+
+        with redis_down():
+            UserSnapshotCache.invalidate(user.pk)
+        self.assertIn(version_key, SafeCache._pending)
+
+        RevocationStore.breaker.reset()
+        SafeCache.get_many([version_key])
+
+        self.assertEqual(SafeCache._pending, {})
+        self.assertIsNotNone(cache.get(version_key))
+
+    def test_revocation_during_outage_is_kept_locally(self) -> None:
+        user = self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+
+        with redis_down():
+            JWTService.revoke_user_tokens([user.pk])
+            UserSnapshotCache._local.clear()
+            response = self.client_for(tokens['access_token']).get('/authapp/profile/')
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_revocation_after_recovery_is_not_masked_by_local_value(self) -> None:
+        user = self.create_user('user@example.com')
+        key = JWTService._get_user_revocation_key(user.pk)
+
+        with redis_down():
+            JWTService.revoke_user_tokens([user.pk])
+        outage_revocation = RevocationStore.get_local(key)
+
+        RevocationStore.breaker.reset()
+        refresh_token = self.login('user@example.com')['refresh_token']
+        JWTService.revoke_user_tokens([user.pk])
+
+        revoked_before = RevocationStore.get_many([key])[key]
+        self.assertGreater(revoked_before, outage_revocation)
+        self.assertIsNone(RevocationStore.get_local(key))
+        self.assertIsNone(JWTService.refresh_access_token(refresh_token))
+
+    def test_replay_does_not_overwrite_newer_revocation(self) -> None:
+        user = self.create_user('user@example.com')
+        key = JWTService._get_user_revocation_key(user.pk)
+
+        with redis_down():
+            JWTService.revoke_user_tokens([user.pk])
+        # Другой процесс отозвал токены позже, пока в этом Redis был недоступен
+        newer = RevocationStore.get_local(key) + 60
+        cache.set(key, newer)
+
+        RevocationStore.breaker.reset()
+        self.assertEqual(RevocationStore.get_many([key])[key], newer)
+        self.assertEqual(cache.get(key), newer)
+        self.assertEqual(RevocationStore._pending, {})
@@ -0,0 +1,72 @@
+from authapp.models import AccessRule, BusinessElement, Role, RoleClosure
+from authapp.services.permission_service import PermissionService
+from authapp.tests.base import AuthTestCase
+
+
+class RolePermissionTests(AuthTestCase):
+    def test_role_without_rule_leaves_element_unrestricted(self) -> None:
+        restricted = Role.objects.create(name='restricted')
+        unrestricted = Role.objects.create(name='unrestricted')
+        element = BusinessElement.objects.create(name='product')
+        AccessRule.objects.create(role=restricted, business_element=element)
+        user = self.create_user('user@example.com', role=restricted)
+
+        self.assertIn('product', PermissionService.load_roles_permissions(user.get_role_ids()))
+        user.roles.add(unrestricted)
+        self.assertNotIn('product', PermissionService.load_roles_permissions(user.get_role_ids()))
+
+
+class RoleHierarchyTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.root = Role.objects.create(name='root')
+        self.middle = Role.objects.create(name='middle', parent=self.root)
+        self.leaf = Role.objects.create(name='leaf', parent=self.middle)
+        self.other = Role.objects.create(name='other')
+
+    def _closure(self) -> set:
+        return set(RoleClosure.objects.values_list('ancestor__name', 'descendant__name', 'depth'))
+
+    def test_closure_follows_moved_subtree(self) -> None:
+        self.assertIn(('root', 'leaf', 2), self._closure())
+
+        self.middle.parent = self.other
+        self.middle.save()
+
+        closure = self._closure()
+        self.assertNotIn(('root', 'middle', 1), closure)
+        self.assertNotIn(('root', 'leaf', 2), closure)
+        self.assertIn(('other', 'middle', 1), closure)
+        self.assertIn(('other', 'leaf', 2), closure)
+        self.assertIn(('middle', 'leaf', 1), closure)
+
+    def test_descendant_inherits_ancestor_rules(self) -> None:
+        product = BusinessElement.objects.create(name='product')
+        order = BusinessElement.objects.create(name='order')
+        AccessRule.objects.create(role=self.root, business_element=product, read_permission=True)
+        AccessRule.objects.create(role=self.other, business_element=order, read_permission=True)
+
+        permissions = PermissionService.load_roles_permissions([self.leaf.pk])
+        self.assertIn('product', permissions)
+        self.assertNotIn('order', permissions)
+
+        self.middle.parent = self.other
+        self.middle.save()
+
+        permissions = PermissionService.load_roles_permissions([self.leaf.pk])
+        self.assertNotIn('product', permissions)
+        self.assertIn('order', permissions)
+
+    def test_cycle_is_rejected(self) -> None:
+        self.root.parent = self.leaf
+        with self.assertRaisesMessage(ValueError, 'Роль не может наследоваться от своей дочерней роли'):
+            self.root.save()
+
+        self.assertIsNone(Role.objects.get(pk=self.root.pk).parent_id)
+        self.assertIn(('root', 'leaf', 2), self._closure())
+
+    def test_deleted_role_detaches_children(self) -> None:
+        self.middle.delete()
+
+        self.assertIsNone(Role.objects.get(pk=self.leaf.pk).parent_id)
+        self.assertEqual({row for row in self._closure() if row[1] == 'leaf'}, {('leaf', 'leaf', 0)})
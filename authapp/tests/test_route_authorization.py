@@ -0,0 +1,39 @@
+from unittest import mock
+
+from rest_framework import exceptions
+from rest_framework.test import APIClient
+
+from authapp.services.authentication import JWTAuthentication
+from authapp.tests.base import AuthTestCase
+
+
+class RouteAuthorizationTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_user('user@example.com')
+        self.create_user('staff@example.com', is_staff=True)
+
+    def test_admin_route_denied_before_view(self) -> None:
+        client = self.client_for(self.login('user@example.com')['access_token'])
+        with mock.patch('authapp.views.UserBulkDeactivateView.post') as view:
+            response = client.post('/authapp/admin/users/deactivate/', {'user_ids': []}, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        view.assert_not_called()
+
+    def test_admin_route_allowed_for_staff(self) -> None:
+        client = self.client_for(self.login('staff@example.com')['access_token'])
+        self.assertEqual(client.get('/authapp/admin/roles/').status_code, 200)
+
+    def test_missing_credentials_match_drf(self) -> None:
+        response = APIClient().get('/authapp/profile/')
+        self.assertEqual(response.status_code, 403)
+        self.assertIn('detail', response.json())
+
+    def test_api_exception_keeps_its_status(self) -> None:
+        client = self.client_for(self.login('user@example.com')['access_token'])
+        with mock.patch.object(JWTAuthentication, 'authenticate', side_effect=exceptions.Throttled(wait=5)):
+            response = client.get('/authapp/profile/')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '5')
@@ -0,0 +1,13 @@
+from authapp.tests.base import AuthTestCase
+
+
+class EmailChangeTests(AuthTestCase):
+    def test_email_change_revokes_tokens(self) -> None:
+        user = self.create_user('old@example.com')
+        client = self.client_for(self.login('old@example.com')['access_token'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.email = 'new@example.com'
+            user.save()
+
+        self.assertEqual(client.get('/authapp/profile/').status_code, 403)
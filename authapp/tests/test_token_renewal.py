@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.test import override_settings
+
+from authapp.services.jwt_service import JWTService
+from authapp.tests.base import AuthTestCase
+
+
+class TokenRenewalTests(AuthTestCase):
+    RENEWAL_WINDOW = settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 60
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.create_user('user@example.com')
+
+    def test_disabled_without_window(self) -> None:
+        response = self.client_for(self.login('user@example.com')['access_token']).get('/authapp/profile/')
+        self.assertNotIn(settings.JWT_SLIDING_RENEWAL_HEADER, response)
+
+    def test_renewed_token_is_issued_once_and_works(self) -> None:
+        with override_settings(JWT_SLIDING_RENEWAL_WINDOW=self.RENEWAL_WINDOW):
+            client = self.client_for(self.login('user@example.com')['access_token'])
+            renewed = {client.get('/authapp/profile/')[settings.JWT_SLIDING_RENEWAL_HEADER] for _ in range(3)}
+
+            self.assertEqual(len(renewed), 1)
+            self.assertEqual(self.client_for(renewed.pop()).get('/authapp/profile/').status_code, 200)
+
+    def test_not_renewed_on_error_response(self) -> None:
+        with override_settings(JWT_SLIDING_RENEWAL_WINDOW=self.RENEWAL_WINDOW):
+            response = self.client_for(self.login('user@example.com')['access_token']).get('/authapp/admin/roles/')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(settings.JWT_SLIDING_RENEWAL_HEADER, response)
+
+    def test_not_renewed_on_logout(self) -> None:
+        with override_settings(JWT_SLIDING_RENEWAL_WINDOW=self.RENEWAL_WINDOW):
+            tokens = self.login('user@example.com', token_mode='reference')
+            client = self.client_for(tokens['access_token'])
+            response = client.post('/authapp/logout/', {'refresh_token': tokens['refresh_token']}, format='json')
+
+            self.assertEqual(response.status_code, 205)
+            self.assertNotIn(settings.JWT_SLIDING_RENEWAL_HEADER, response)
+            self.assertEqual(client.get('/authapp/profile/').status_code, 403)
+
+    def test_not_renewed_for_revoked_token(self) -> None:
+        tokens = self.login('user@example.com')
+        payload = JWTService.verify_token(tokens['access_token'])
+        JWTService.revoke_user_tokens([payload['id']])
+
+        self.assertIsNone(JWTService.get_renewed_access_token(tokens['access_token'], payload))
@@ -0,0 +1,27 @@
+from django.contrib.admin.sites import site
+from django.test import RequestFactory
+
+from authapp.models import User
+from authapp.tests.base import AuthTestCase
+
+
+class UserAdminSearchTests(AuthTestCase):
+    def search(self, term: str) -> list:
+        admin = site._registry[User]
+        request = RequestFactory().get('/admin/authapp/user/', {'q': term})
+        queryset, _ = admin.get_search_results(request, User.objects.all(), term)
+        return sorted(queryset.values_list('email', flat=True))
+
+    def test_email_prefix_search(self) -> None:
+        self.create_user('ivan@example.com')
+        self.create_user('ivanov@example.org')
+
+        self.assertEqual(self.search('ivan@'), ['ivan@example.com'])
+        self.assertEqual(self.search('IVANOV@example'), ['ivanov@example.org'])
+
+    def test_domain_search_matches_anywhere(self) -> None:
+        self.create_user('ivan@example.com')
+        self.create_user('petr@example.com')
+        self.create_user('anna@example.org')
+
+        self.assertEqual(self.search('@example.com'), ['ivan@example.com', 'petr@example.com'])
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+
+from authapp.models import Role, User
+from authapp.services.user_cache import UserSnapshotCache
+from authapp.tests.base import AuthTestCase
+
+
+class UserSnapshotCacheTests(AuthTestCase):
+    def test_snapshot_read_before_invalidation_is_discarded(self) -> None:
+        user = self.create_user('user@example.com')
+        stamp = (cache.get(UserSnapshotCache.GENERATION_KEY), cache.get(UserSnapshotCache._get_version_key(user.pk)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.first_name = 'Петр'
+            user.save()
+        # Запоздавшая запись снимка, прочитанного до сохранения
+        stale = User.objects.filter(pk=user.pk).values_list(*UserSnapshotCache.SNAPSHOT_FIELDS).first()
+        stale = tuple('Иван' if field == 'first_name' else value for field, value in zip(UserSnapshotCache.SNAPSHOT_FIELDS, stale))
+        cache.set(UserSnapshotCache._get_cache_key(user.pk), {'values': stale, 'stamp': stamp})
+        UserSnapshotCache._local.clear()
+
+        self.assertEqual(UserSnapshotCache.get_user(user.pk).first_name, 'Петр')
+
+    def test_role_save_keeps_snapshots_and_delete_drops_them(self) -> None:
+        role = Role.objects.create(name='reader')
+        user = self.create_user('user@example.com', role=role)
+        UserSnapshotCache.get_user(user.pk)
+        generation = cache.get(UserSnapshotCache.GENERATION_KEY)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            role.name = 'viewer'
+            role.save()
+        self.assertEqual(cache.get(UserSnapshotCache.GENERATION_KEY), generation)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            role.delete()
+        self.assertNotEqual(cache.get(UserSnapshotCache.GENERATION_KEY), generation)
+        self.assertIsNone(UserSnapshotCache.get_user(user.pk).role_id)
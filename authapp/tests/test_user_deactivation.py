@@ -0,0 +1,61 @@
+from django.test import override_settings
+
+from authapp.services.jwt_service import JWTService
+from authapp.tests.base import AuthTestCase
+
+
+class UserDeactivationTests(AuthTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.admin = self.create_user('admin@example.com', is_staff=True, is_superuser=True)
+        self.admin_client = self.client_for(self.login('admin@example.com')['access_token'])
+
+    def test_deactivation_revokes_tokens_until_new_login(self) -> None:
+        user = self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+        client = self.client_for(tokens['access_token'])
+        self.assertEqual(client.get('/authapp/profile/').status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin_client.post('/authapp/admin/users/deactivate/', {'user_ids': [user.pk]}, format='json')
+        self.assertEqual(client.get('/authapp/profile/').status_code, 403)
+        self.assertIsNone(JWTService.refresh_access_token(tokens['refresh_token']))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin_client.post('/authapp/admin/users/reactivate/', {'user_ids': [user.pk]}, format='json')
+        self.assertEqual(client.get('/authapp/profile/').status_code, 403)
+
+        new_tokens = self.login('user@example.com')
+        self.assertEqual(self.client_for(new_tokens['access_token']).get('/authapp/profile/').status_code, 200)
+
+    def test_self_delete_revokes_tokens(self) -> None:
+        self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+        client = self.client_for(tokens['access_token'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(client.delete('/authapp/delete/').status_code, 200)
+
+        self.assertEqual(client.get('/authapp/profile/').status_code, 403)
+        self.assertIsNone(JWTService.refresh_access_token(tokens['refresh_token']))
+
+    def test_v2_token_from_the_same_second_is_revoked(self) -> None:
+        revoked_before = 1700000000.5
+
+        self.assertTrue(JWTService.is_issued_before_revocation({'iat': 1700000000, 'ms': 499}, revoked_before))
+        self.assertTrue(JWTService.is_issued_before_revocation({'iat': 1700000000, 'ms': 500}, revoked_before))
+        self.assertFalse(JWTService.is_issued_before_revocation({'iat': 1700000000, 'ms': 501}, revoked_before))
+        # Токен v2 без миллисекунд из той же секунды тоже считается отозванным
+        self.assertTrue(JWTService.is_issued_before_revocation({'iat': 1700000000}, revoked_before))
+
+    @override_settings(JWT_TOKEN_VERSION=2)
+    def test_v2_tokens_are_revoked_on_deactivation(self) -> None:
+        user = self.create_user('user@example.com')
+        tokens = self.login('user@example.com')
+        self.assertIn('ms', JWTService.decode_token(tokens['access_token']))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin_client.post('/authapp/admin/users/deactivate/', {'user_ids': [user.pk]}, format='json')
+
+        self.assertEqual(self.client_for(tokens['access_token']).get('/authapp/profile/').status_code, 403)
+        self.assertIsNone(JWTService.refresh_access_token(tokens['refresh_token']))
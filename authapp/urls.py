@@ -1,6 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AccessRuleViewSet, ProductMockView, RegisterView, LoginView, LogoutView, RoleViewSet, UserProfileView, DeleteUserView
+from .views import (
+    AccessRuleViewSet, ProductMockView, RegisterView, LoginView, LogoutView, RoleViewSet, TokenRefreshView,
+    UserProfileView, DeleteUserView, TokenIntrospectionView, TokenIntrospectionBatchView,
+    UserBulkDeactivateView, UserBulkReactivateView, UserRolesView, PolicyBundleView, ExportView,
+    ActivityStatsView, PolicySimulationView, ClientTokenView
+)
 
 router = DefaultRouter()
 router.register(r'roles', RoleViewSet, basename='role')
@@ -9,9 +14,20 @@ router.register(r'access-rules', AccessRuleViewSet, basename='access-rule')
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
+    path('refresh/', TokenRefreshView.as_view(), name='refresh'),
+    path('token/', ClientTokenView.as_view(), name='client-token'),
     path('logout/', LogoutView.as_view(), name='logout'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('delete/', DeleteUserView.as_view(), name='delete'),
     path('products/', ProductMockView.as_view(), name='products'),
+    path('introspect/', TokenIntrospectionView.as_view(), name='introspect'),
+    path('introspect/batch/', TokenIntrospectionBatchView.as_view(), name='introspect-batch'),
+    path('admin/users/deactivate/', UserBulkDeactivateView.as_view(), name='users-deactivate'),
+    path('admin/users/reactivate/', UserBulkReactivateView.as_view(), name='users-reactivate'),
+    path('admin/users/<int:pk>/roles/', UserRolesView.as_view(), name='user-roles'),
+    path('admin/policy-bundle/', PolicyBundleView.as_view(), name='policy-bundle'),
+    path('admin/policy-simulation/', PolicySimulationView.as_view(), name='policy-simulation'),
+    path('admin/activity/', ActivityStatsView.as_view(), name='activity-stats'),
+    path('admin/export/<str:dataset>/', ExportView.as_view(), name='export'),
     path('admin/', include(router.urls)),
 ]
\ No newline at end of file
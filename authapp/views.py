@@ -1,18 +1,26 @@
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework import generics, viewsets
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 
+from authapp.exceptions import ActivityStoreUnavailable
 from authapp.services.authentication import PasswordAuthentication
 
 from .models import AccessRule, User, Role
 from .serializers import (
-    AccessRuleSerializer, LoginResponseSerializer, LogoutSerializer, 
-    RoleSerializer, TokenPairSerializer, UserRegisterSerializer, 
-    UserLoginSerializer, UserSerializer
+    AccessRuleSerializer, ClientCredentialsSerializer, FastLoginResponseSerializer, FastUserSerializer, LogoutSerializer,
+    PolicySimulationSerializer, RoleSerializer, TokenIntrospectBatchSerializer, TokenIntrospectSerializer,
+    TokenPairSerializer, TokenRefreshResponseSerializer, TokenRefreshSerializer,
+    UserBulkActiveSerializer, UserRegisterSerializer, UserLoginSerializer, UserRolesSerializer,
+    UserSerializer
+)
+from .services import (
+    ActivityService, ClientCredentialsService, ExportService, JWTService, JWTAuthentication, LastSeenService, PolicyBundleService,
+    PolicySimulationService, TokenIntrospectionService, UserService
 )
-from .services import JWTService, JWTAuthentication
 from .permissions import HasPermission
 
 
@@ -31,7 +39,9 @@ class LoginView(APIView):
     
     def post(self, request) -> Response:
         login_serializer = UserLoginSerializer(data=request.data)
-        login_serializer.is_valid(raise_exception=True)
+        if not login_serializer.is_valid():
+            ActivityService.record(ActivityService.EVENT_LOGIN_FAILED)
+            raise ValidationError(login_serializer.errors)
             
         
         user_instance = PasswordAuthentication.authenticate_user(
@@ -41,19 +51,56 @@ class LoginView(APIView):
         )
 
         if not user_instance:
+            ActivityService.record(ActivityService.EVENT_LOGIN_FAILED)
             return Response({"detail": "Неверные учетные данные"}, status=401)
         
+        ActivityService.record(ActivityService.EVENT_LOGIN, user_instance.id)
+        LastSeenService.touch(user_instance.id, LastSeenService.FIELD_LAST_LOGIN, LastSeenService.FIELD_LAST_SEEN)
         tokens = JWTService.generate_token_pair({
             'id': user_instance.id,
             'email': user_instance.email
-        })
+        }, token_mode=login_serializer.validated_data.get('token_mode'))
+
+        response_data = FastLoginResponseSerializer.to_representation(
+            user_instance, tokens, 'Успешная авторизация'
+        )
+        return Response(response_data, status=200)
+
+class TokenRefreshView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request) -> Response:
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        response_serializer = LoginResponseSerializer({
-            'user': user_instance,
-            'tokens': tokens,
-            'message': 'Успешная авторизация'
-        })
-        return Response(response_serializer.data, status=200)
+        access_token = JWTService.refresh_access_token(
+            serializer.validated_data['refresh_token'],
+            token_mode=serializer.validated_data.get('token_mode')
+        )
+        if not access_token:
+            ActivityService.record(ActivityService.EVENT_REFRESH_FAILED)
+            return Response({'detail': 'Недействительный refresh токен'}, status=401)
+
+        ActivityService.record(ActivityService.EVENT_REFRESH)
+        return Response(TokenRefreshResponseSerializer({
+            'access_token': access_token,
+            'expires_in': int(JWTService.ACCESS_TOKEN_EXPIRE_MINUTES.total_seconds())
+        }).data, status=200)
+
+class ClientTokenView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request) -> Response:
+        serializer = ClientCredentialsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        tokens = ClientCredentialsService.issue_token(
+            serializer.validated_data['client_id'],
+            serializer.validated_data['client_secret']
+        )
+        if not tokens:
+            return Response({'detail': 'Неверные учетные данные клиента'}, status=401)
+        return Response(tokens, status=200)
 
 class LogoutView(APIView):
     permission_classes = [HasPermission]
@@ -64,6 +111,10 @@ class LogoutView(APIView):
         refresh_token = logout_serializer.validated_data['refresh_token']
         
         success = JWTService.blacklist_refresh_token(refresh_token)
+        if JWTService.is_reference_token(request.auth):
+            JWTService.revoke_reference_token(request.auth)
+        # После выхода продленный access токен не выдается
+        request._request.token_renewal = None
         if success:
             return Response({'message': 'Успешный выход из системы'}, status=205)
         else:
@@ -74,16 +125,93 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self) -> User:
+        # request.user собран из кэша; изменения применяются к актуальной строке
+        if self.request.method in ('PUT', 'PATCH'):
+            return User.objects.get(pk=self.request.user.pk)
         return self.request.user
 
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        return Response(FastUserSerializer.to_representation(self.get_object()))
+
 class DeleteUserView(APIView):
     permission_classes = [HasPermission]
 
     def delete(self, request) -> Response:
-        user = request.user
-        user.soft_delete()
+        # Как и массовая деактивация: токены отзываются, а кэши сбрасываются во всех процессах
+        UserService.bulk_set_active([request.user.pk], is_active=False)
         return Response({'message': 'Пользователь удален'}, status=200)
 
+class UserBulkDeactivateView(APIView):
+    permission_classes = [IsAdminUser]
+    is_active = False
+
+    def post(self, request) -> Response:
+        serializer = UserBulkActiveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        updated = UserService.bulk_set_active(serializer.validated_data['user_ids'], is_active=self.is_active)
+        return Response({'updated': updated}, status=200)
+
+class UserBulkReactivateView(UserBulkDeactivateView):
+    is_active = True
+
+class UserRolesView(generics.RetrieveUpdateAPIView):
+    permission_classes = [IsAdminUser]
+    queryset = User.objects.all()
+    serializer_class = UserRolesSerializer
+
+class ActivityStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request) -> Response:
+        try:
+            stats = ActivityService.get_stats()
+        except ActivityStoreUnavailable as e:
+            return Response({'detail': str(e)}, status=503)
+        return Response(stats, status=200)
+
+class PolicyBundleView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request) -> HttpResponse:
+        bundle = PolicyBundleService.get_bundle()
+        binary = request.query_params.get('encoding') == 'binary'
+
+        etag = f'"{bundle["version"]}-bin"' if binary else f'"{bundle["version"]}"'
+        if_none_match = [value.strip() for value in request.headers.get('If-None-Match', '').split(',')]
+        if etag in if_none_match or '*' in if_none_match:
+            return HttpResponse(status=304, headers={'ETag': etag})
+
+        return HttpResponse(
+            bundle['binary'] if binary else bundle['json'],
+            content_type='application/octet-stream' if binary else 'application/json',
+            headers={'ETag': etag}
+        )
+
+class PolicySimulationView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request) -> Response:
+        # Пробный прогон: правила в БД не меняются
+        serializer = PolicySimulationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(PolicySimulationService.simulate(serializer.validated_data['changes']), status=200)
+
+class ExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, dataset: str) -> StreamingHttpResponse:
+        # Параметр format занят DRF для выбора рендерера, поэтому формат выгрузки передается в output
+        export_format = request.query_params.get('output', ExportService.FORMAT_CSV)
+        if dataset not in ExportService.DATASETS or export_format not in ExportService.FORMATS:
+            return Response({'error': 'Неизвестный набор данных или формат'}, status=404)
+
+        return StreamingHttpResponse(
+            ExportService.stream(dataset, export_format),
+            content_type=ExportService.CONTENT_TYPES[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{dataset}.{export_format}"'}
+        )
+
 class RoleViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     queryset = Role.objects.all()
@@ -95,6 +223,8 @@ class AccessRuleViewSet(viewsets.ModelViewSet):
     serializer_class = AccessRuleSerializer
 
 class ProductMockView(APIView):
+    # Без PermissionScopedCacheMixin: тело собирается из request.user без обращений к БД,
+    # и чтение из кэша обошлось бы дороже самого ответа
     permission_classes = [HasPermission]
     business_element = 'product'
 
@@ -105,6 +235,30 @@ class ProductMockView(APIView):
 
         return Response(product, status=200)
 
+class TokenIntrospectionView(APIView):
+    permission_classes = [HasPermission]
+    business_element = 'token_introspection'
+    require_access_rule = True
+
+    def post(self, request) -> Response:
+        serializer = TokenIntrospectSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = TokenIntrospectionService.introspect(serializer.validated_data['token'])
+        return Response(result, status=200)
+
+class TokenIntrospectionBatchView(APIView):
+    permission_classes = [HasPermission]
+    business_element = 'token_introspection'
+    require_access_rule = True
+
+    def post(self, request) -> Response:
+        serializer = TokenIntrospectBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = TokenIntrospectionService.introspect_many(serializer.validated_data['tokens'])
+        return Response({'results': results}, status=200)
+
         
 
 
@@ -32,12 +32,52 @@ DEBUG = config('DEBUG', default=False, cast=bool)
 JWT_ALGORITHM = config('JWT_ALGORITHM', default='HS256')
 JWT_ACCESS_TOKEN_EXPIRE_MINUTES = config('JWT_ACCESS_TOKEN_EXPIRE_MINUTES', default=30, cast=int)
 JWT_REFRESH_TOKEN_EXPIRE_DAYS = config('JWT_REFRESH_TOKEN_EXPIRE_DAYS', default=7, cast=int)
+JWT_TOKEN_VERSION = config('JWT_TOKEN_VERSION', default=1, cast=int)
+JWT_TOKEN_INCLUDE_EMAIL = config('JWT_TOKEN_INCLUDE_EMAIL', default=False, cast=bool)
+JWT_ACCESS_TOKEN_MODE = config('JWT_ACCESS_TOKEN_MODE', default='jwt')
+JWT_SLIDING_RENEWAL_WINDOW = config('JWT_SLIDING_RENEWAL_WINDOW', default=0, cast=int)
+JWT_SLIDING_RENEWAL_HEADER = config('JWT_SLIDING_RENEWAL_HEADER', default='X-Access-Token')
+
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', default=0.0, cast=float)
+PROFILING_DIR = config('PROFILING_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILING_HEADER = config('PROFILING_HEADER', default='X-Profile-Token')
+PROFILING_TOKEN_MAX_AGE = config('PROFILING_TOKEN_MAX_AGE', default=3600, cast=int)
+
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=False, cast=bool)
+
+USER_CACHE_TTL = config('USER_CACHE_TTL', default=60, cast=int)
+USER_CACHE_LOCAL_TTL = config('USER_CACHE_LOCAL_TTL', default=5, cast=int)
+USER_CACHE_LOCAL_MAX_SIZE = config('USER_CACHE_LOCAL_MAX_SIZE', default=10000, cast=int)
+PERMISSION_CACHE_TTL = config('PERMISSION_CACHE_TTL', default=3600, cast=int)
+PERMISSION_CACHE_LOCAL_TTL = config('PERMISSION_CACHE_LOCAL_TTL', default=5, cast=int)
+REDIS_SOCKET_TIMEOUT = config('REDIS_SOCKET_TIMEOUT', default=0.2, cast=float)
+REDIS_SOCKET_CONNECT_TIMEOUT = config('REDIS_SOCKET_CONNECT_TIMEOUT', default=0.2, cast=float)
+REVOCATION_BREAKER_FAILURE_THRESHOLD = config('REVOCATION_BREAKER_FAILURE_THRESHOLD', default=3, cast=int)
+REVOCATION_BREAKER_RESET_TIMEOUT = config('REVOCATION_BREAKER_RESET_TIMEOUT', default=5, cast=float)
+REVOCATION_FALLBACK_MAX_SIZE = config('REVOCATION_FALLBACK_MAX_SIZE', default=10000, cast=int)
+REVOCATION_FAIL_MODE = config('REVOCATION_FAIL_MODE', default='open')
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = config('ADMIN_ESTIMATED_COUNT_THRESHOLD', default=100000, cast=int)
+RESPONSE_CACHE_TTL = config('RESPONSE_CACHE_TTL', default=60, cast=int)
+ACTIVITY_TRACKING_ENABLED = config('ACTIVITY_TRACKING_ENABLED', default=True, cast=bool)
+LAST_SEEN_FLUSH_INTERVAL = config('LAST_SEEN_FLUSH_INTERVAL', default=60, cast=int)
+LAST_SEEN_FLUSH_BATCH_SIZE = config('LAST_SEEN_FLUSH_BATCH_SIZE', default=1000, cast=int)
+SERVICE_CLIENT_CACHE_TTL = config('SERVICE_CLIENT_CACHE_TTL', default=300, cast=int)
+ROUTE_AUTHORIZATION_ENABLED = config('ROUTE_AUTHORIZATION_ENABLED', default=True, cast=bool)
+
+USER_BULK_MAX_SIZE = config('USER_BULK_MAX_SIZE', default=1000, cast=int)
+
+INTROSPECTION_BATCH_MAX_SIZE = config('INTROSPECTION_BATCH_MAX_SIZE', default=100, cast=int)
+INTROSPECTION_CACHE_MAX_TTL = config('INTROSPECTION_CACHE_MAX_TTL', default=3600, cast=int)
 
 POSTGRES_DB = config('POSTGRES_DB', default='simple_auth_db')
 POSTGRES_USER = config('POSTGRES_USER', default='postgres')
 POSTGRES_PASSWORD = config('POSTGRES_PASSWORD', default='postgres')
 DB_HOST = config('DB_HOST', default='localhost')
 DB_PORT = config('DB_PORT', default='5432')
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=int)
 
 REDIS_URL = config('REDIS_URL')
 
@@ -53,17 +93,23 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'authapp',
 ]
 
 MIDDLEWARE = [
+    'authapp.middleware.ServerTimingMiddleware',
+    'authapp.middleware.SampledProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'authapp.middleware.ReplicaPinMiddleware',
+    'authapp.middleware.TokenRenewalMiddleware',
+    'authapp.middleware.RouteAuthorizationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -103,6 +149,21 @@ DATABASES = {
     }
 }
 
+# Реплики только для чтения: DB_REPLICA_HOSTS=replica1,replica2:5433
+DATABASE_REPLICAS = []
+for index, replica_host in enumerate(DB_REPLICA_HOSTS, start=1):
+    host, _, port = replica_host.partition(':')
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DB_PORT,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['authapp.db_router.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -143,6 +204,10 @@ CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "socket_connect_timeout": REDIS_SOCKET_CONNECT_TIMEOUT,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        },
     }
 }
 
@@ -166,3 +231,10 @@ REST_FRAMEWORK = {
     )
 }
 
+# Рендерер на orjson; при отсутствии пакета используется стандартный JSONRenderer
+if config('FAST_JSON_RENDERER', default=False, cast=bool):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'authapp.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+
@@ -0,0 +1,34 @@
+"""
+Настройки для тестов: SQLite и кэш в памяти вместо PostgreSQL и Redis.
+
+python manage.py test authapp --settings=config.test_settings
+"""
+import os
+
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+from config.settings import *  # noqa: E402,F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',  # noqa: F405
+    },
+}
+# Реплика - зеркало основной БД. Включается в тестах роутера через override_settings(DATABASE_REPLICAS=...):
+# TestCase не оборачивает зеркало в транзакцию, и чтение с него не видит незакоммиченных данных
+DATABASES['replica_1'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = []
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# bcrypt на каждом входе заметно замедляет тесты
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Фоновая запись last_seen не должна срабатывать во время тестов
+LAST_SEEN_FLUSH_INTERVAL = 3600